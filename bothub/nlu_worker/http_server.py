@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from aiohttp import web
+
+from bothub.shared.utils.rasa_components.bothub_interpreter import normalize_outputs
+
+logger = logging.getLogger(__name__)
+
+# optional arguments of the parse functions accepted from HTTP requests
+PARSE_OPTIONS = ["rasa_format", "outputs"]
+
+
+def parse_request(body, text_field):
+    """Validated arguments of a parse request body.
+
+    :return: (repository_version, repository_authorization, text, options),
+        raising ValueError or KeyError on invalid bodies
+    """
+    if not isinstance(body, dict):
+        raise ValueError("the body must be a JSON object")
+
+    required = ["repository_version", "repository_authorization", text_field]
+    unknown = sorted(set(body) - set(required) - set(PARSE_OPTIONS))
+    if unknown:
+        raise ValueError(f"unknown arguments {unknown}")
+
+    text = body[text_field]
+    texts = text if text_field == "texts" else [text]
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        kind = "a list of strings" if text_field == "texts" else "a string"
+        raise ValueError(f"{text_field} must be {kind}")
+
+    options = {}
+    if "rasa_format" in body:
+        if not isinstance(body["rasa_format"], bool):
+            raise ValueError("rasa_format must be a boolean")
+        options["rasa_format"] = body["rasa_format"]
+    if body.get("outputs") is not None:
+        if not isinstance(body["outputs"], list):
+            raise ValueError("outputs must be a list")
+        options["outputs"] = normalize_outputs(body["outputs"])
+
+    return (
+        body["repository_version"],
+        body["repository_authorization"],
+        text,
+        options,
+    )
+
+
+class ParseServer:
+    """HTTP server parsing texts with the interpreters of the worker.
+
+    It runs an asyncio loop in a thread of the worker process, so parses
+    skip the broker and the result backend. Parses run on a pool of
+    `workers` threads. Requests beyond `max_pending` running or queued
+    parses are answered with 503 instead of waiting.
+
+    Routes:
+        POST /parse: {"repository_version", "repository_authorization",
+            "text"} plus the optional "rasa_format" and "outputs"
+        POST /parse_batch: same, with "texts" instead of "text"
+        GET /metrics: worker metrics in Prometheus text format
+        GET /health
+
+    Other arguments of the parse functions, like use_cache and debug, are
+    not accepted from requests.
+    """
+
+    def __init__(self, parse, parse_batch, metrics_text, workers=5, max_pending=50):
+        self.parse = parse
+        self.parse_batch = parse_batch
+        self.metrics_text = metrics_text
+        self.max_pending = max_pending
+        self.pending = 0
+
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._loop = None
+        self._runner = None
+
+    def app(self):
+        app = web.Application()
+        app.add_routes(
+            [
+                web.post("/parse", partial(self._handle_parse, self.parse, "text")),
+                web.post(
+                    "/parse_batch",
+                    partial(self._handle_parse, self.parse_batch, "texts"),
+                ),
+                web.get("/metrics", self._handle_metrics),
+                web.get("/health", self._handle_health),
+            ]
+        )
+        return app
+
+    async def _run(self, function, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(function, *args, **kwargs)
+        )
+
+    async def _handle_parse(self, parse, text_field, request):
+        try:
+            (
+                repository_version,
+                repository_authorization,
+                text,
+                options,
+            ) = parse_request(await request.json(), text_field)
+        except (ValueError, KeyError) as e:
+            return web.json_response(
+                {
+                    "error": f"Invalid request, a JSON object with {text_field}, "
+                    f"repository_version and repository_authorization is "
+                    f"required: {e}"
+                },
+                status=400,
+            )
+
+        # the handlers run in the loop thread, no lock is needed
+        if self.pending >= self.max_pending:
+            return web.json_response({"error": "Too many pending parses"}, status=503)
+
+        self.pending += 1
+        try:
+            result = await self._run(
+                parse, repository_version, repository_authorization, text, **options
+            )
+        except Exception as e:
+            logger.exception(e)
+            return web.json_response({"error": str(e)}, status=500)
+        finally:
+            self.pending -= 1
+
+        return web.json_response(result)
+
+    async def _handle_metrics(self, request):
+        return web.Response(text=await self._run(self.metrics_text))
+
+    async def _handle_health(self, request):
+        return web.json_response({"pending": self.pending})
+
+    def start(self, host, port):
+        """Starts serving in a daemon thread."""
+        self._loop = asyncio.new_event_loop()
+        self._runner = web.AppRunner(self.app())
+        self._loop.run_until_complete(self._runner.setup())
+        self._loop.run_until_complete(web.TCPSite(self._runner, host, port).start())
+
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        logger.info(f"Parse server listening on {host}:{port}")
+
+    def stop(self, timeout=10):
+        if self._loop is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(
+            timeout
+        )
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._executor.shutdown(wait=False)
+        self._loop = None
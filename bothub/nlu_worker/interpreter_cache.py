@@ -0,0 +1,184 @@
+import gc
+import logging
+import shutil
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+CACHE_POLICIES = ["lru", "lfu"]
+
+
+class InterpreterCache:
+    """Bounded cache of loaded interpreters.
+
+    Entries are evicted when the cache holds more than `max_entries`
+    interpreters or when the sum of their estimated sizes exceeds
+    `max_memory` bytes. A value of 0 disables the respective limit.
+    """
+
+    def __init__(self, max_entries=0, max_memory=0, policy="lru"):
+        if policy not in CACHE_POLICIES:
+            raise ValueError(
+                f"'{policy}' is not a valid cache policy. Choose from {CACHE_POLICIES}"
+            )
+
+        self.max_entries = max_entries
+        self.max_memory = max_memory
+        self.policy = policy
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._collecting = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def memory(self):
+        with self._lock:
+            return sum(entry["size"] for entry in self._entries.values())
+
+    def get(self, key, last_training=None):
+        """Return the cached entry of `key`, counting a hit or a miss.
+
+        If `last_training` is given, entries of a different training are
+        treated as a miss. The entry returned is a copy, so its interpreter
+        stays usable if the entry leaves the cache.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (
+                last_training is not None and entry["last_training"] != last_training
+            ):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            entry["uses"] += 1
+            self._entries.move_to_end(key)
+            return dict(entry)
+
+    def peek(self, key):
+        """Return a copy of the cached entry of `key` without touching its
+        statistics."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else dict(entry)
+
+    def put(self, key, interpreter, last_training, size=0, model_directory=None):
+        """Caches an interpreter.
+
+        If `model_directory` is given it is owned by the entry and removed
+        when the entry leaves the cache.
+        """
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            self._entries[key] = {
+                "last_training": last_training,
+                "interpreter_data": interpreter,
+                "size": size,
+                "uses": previous["uses"] if previous else 0,
+                "model_directory": model_directory,
+            }
+            evicted = self._evict(protected_key=key)
+
+        if previous is not None and previous["interpreter_data"] is not interpreter:
+            evicted.append(previous)
+        self._release(evicted)
+
+    def pop(self, key):
+        """Removes and releases the entry of `key`, if cached."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self._release([entry])
+
+    def clear(self):
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+
+        self._release(entries)
+
+    def info(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "memory": sum(entry["size"] for entry in self._entries.values()),
+                "max_entries": self.max_entries,
+                "max_memory": self.max_memory,
+                "policy": self.policy,
+            }
+
+    def _over_limit(self):
+        if self.max_entries and len(self._entries) > self.max_entries:
+            return True
+        if self.max_memory and self.memory > self.max_memory:
+            return True
+        return False
+
+    def _choose_victim(self, protected_key):
+        candidates = [key for key in self._entries if key != protected_key]
+        if not candidates:
+            return None
+        if self.policy == "lfu":
+            # min() keeps the first of equal candidates, i.e. the least recent one
+            return min(candidates, key=lambda key: self._entries[key]["uses"])
+        return candidates[0]
+
+    def _evict(self, protected_key=None):
+        evicted = []
+        while self._over_limit():
+            victim = self._choose_victim(protected_key)
+            if victim is None:
+                # a single entry bigger than the memory limit is still cached
+                break
+            logger.info(f"Evicting interpreter {victim} from cache")
+            evicted.append(self._entries.pop(victim))
+            self.evictions += 1
+        return evicted
+
+    def _release(self, entries):
+        """Frees what the cache owned of `entries`, already removed from it.
+
+        TensorFlow variables and graphs owned by an interpreter are freed
+        when the last reference is collected, so parses still running with
+        an evicted interpreter finish normally. The model files are already
+        loaded in memory, so owned model directories are removed right away.
+        """
+        if not entries:
+            return
+
+        for entry in entries:
+            if entry.get("model_directory"):
+                shutil.rmtree(entry["model_directory"], ignore_errors=True)
+        self._collect_in_background()
+
+    def _collect_in_background(self):
+        """Runs gc.collect() out of the thread that released the entries,
+        usually a parse, once at a time."""
+        with self._lock:
+            if self._collecting:
+                return
+            self._collecting = True
+
+        def collect():
+            try:
+                gc.collect()
+            finally:
+                with self._lock:
+                    self._collecting = False
+
+        threading.Thread(target=collect, daemon=True).start()
@@ -1,19 +1,95 @@
-from rasa.nlu import components
-from tempfile import mkdtemp
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
 
+from bothub.nlu_worker import settings
+from bothub.nlu_worker.interpreter_cache import InterpreterCache
+from bothub.nlu_worker.metrics import metrics_from_settings
 from bothub.shared.utils.persistor import BothubPersistor
 from bothub.shared.utils.backend import backend
+from bothub.shared.utils.helpers import get_directory_size
+from bothub.shared.utils.model_store import ModelStore
 from bothub.shared.utils.rasa_components.bothub_interpreter import BothubInterpreter
+from bothub.shared.utils.rasa_components.component_builder import (
+    shared_component_builder,
+)
+from bothub.shared.utils.temporary_directories import (
+    make_temporary_directory,
+    remove_directory,
+    temporary_directories_usage,
+)
 
+logger = logging.getLogger(__name__)
 
-class InterpreterManager:
-    def __init__(self):
-        self.cached_interpreters = {}
+# request_uses keeps its most used half once it counts more keys than this
+REQUEST_USES_MAX_KEYS = 10000
 
-    def get_interpreter(
-        self, repository_version, repository_authorization, rasa_version, use_cache=True
+
+class InterpreterManager:
+    def __init__(
+        self,
+        max_entries=None,
+        max_memory=None,
+        policy=None,
+        freshness_ttl=None,
+        model_store_dir=None,
+        hot_swap=None,
+        metrics=None,
     ):
+        self.cached_interpreters = InterpreterCache(
+            max_entries=settings.BOTHUB_NLP_INTERPRETER_CACHE_MAX_ENTRIES
+            if max_entries is None
+            else max_entries,
+            max_memory=settings.BOTHUB_NLP_INTERPRETER_CACHE_MAX_MEMORY
+            if max_memory is None
+            else max_memory,
+            policy=policy or settings.BOTHUB_NLP_INTERPRETER_CACHE_POLICY,
+        )
+
+        # seconds a validated training is trusted without asking the backend,
+        # 0 validates it on every request
+        self.freshness_ttl = (
+            settings.BOTHUB_NLP_INTERPRETER_FRESHNESS_TTL
+            if freshness_ttl is None
+            else freshness_ttl
+        )
+        # keep serving the previous training while a new one loads in background
+        self.hot_swap = (
+            settings.BOTHUB_NLP_INTERPRETER_HOT_SWAP if hot_swap is None else hot_swap
+        )
+        # extracted models are kept on disk to be reloaded without downloading,
+        # an empty directory disables the store
+        model_store_dir = (
+            settings.BOTHUB_NLP_MODEL_STORE_DIR
+            if model_store_dir is None
+            else model_store_dir
+        )
+        self.model_store = (
+            ModelStore(model_store_dir, settings.BOTHUB_NLP_MODEL_STORE_MAX_SIZE)
+            if model_store_dir
+            else None
+        )
+        self.metrics = metrics or metrics_from_settings()
+        self._reported_evictions = 0
 
+        # (repository_version, repository_authorization) -> number of requests
+        self.request_uses = Counter()
+        # (repository_version, repository_authorization) -> last validated training
+        self.validated_trainings = {}
+        self._revalidating = set()
+        # (repository_name, last_training) -> Future of the interpreter being loaded
+        self._loading = {}
+        self._swapping = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _request_key(repository_version, repository_authorization):
+        return str(repository_version), str(repository_authorization)
+
+    @staticmethod
+    def _request_update(repository_version, repository_authorization, rasa_version):
         update_request = backend().request_backend_parse_nlu_persistor(
             repository_version, repository_authorization, rasa_version, no_bot_data=True
         )
@@ -23,31 +99,365 @@ class InterpreterManager:
         )
         last_training = f"{update_request.get('total_training_end')}"
 
-        # tries to fetch cache
-        cached_retrieved = self.cached_interpreters.get(repository_name)
-        if cached_retrieved and use_cache:
-            # returns cache only if it's the same training
-            if cached_retrieved["last_training"] == last_training:
+        return update_request, repository_name, last_training
+
+    def _set_validated(self, request_key, repository_name, last_training):
+        with self._lock:
+            self.validated_trainings[request_key] = {
+                "repository_name": repository_name,
+                "last_training": last_training,
+                "validated_at": time.monotonic(),
+            }
+
+    def _forget_validated(self, request_key):
+        with self._lock:
+            self.validated_trainings.pop(request_key, None)
+
+    def _prune_validated(self):
+        """Forget the validated trainings of repositories no longer cached."""
+        with self._lock:
+            for request_key, validated in list(self.validated_trainings.items()):
+                if validated["repository_name"] not in self.cached_interpreters:
+                    del self.validated_trainings[request_key]
+
+    def _get_trusted_interpreter(
+        self, request_key, repository_authorization, rasa_version
+    ):
+        """Returns the cached interpreter of a recently validated training.
+
+        Once the ttl expires the cached interpreter is still returned while the
+        training is revalidated in background.
+        """
+        validated = self.validated_trainings.get(request_key)
+        if validated is None:
+            return None
+
+        cached_retrieved = self.cached_interpreters.peek(validated["repository_name"])
+        if (
+            cached_retrieved is None
+            or cached_retrieved["last_training"] != validated["last_training"]
+        ):
+            return None
+        # counts the hit
+        cached_retrieved = self.cached_interpreters.get(validated["repository_name"])
+        if cached_retrieved is None:
+            return None
+        self.metrics.increment("interpreter_cache_hits_total")
+
+        if time.monotonic() - validated["validated_at"] > self.freshness_ttl:
+            self._revalidate_in_background(
+                request_key, repository_authorization, rasa_version
+            )
+
+        return cached_retrieved["interpreter_data"]
+
+    def _revalidate_in_background(
+        self, request_key, repository_authorization, rasa_version
+    ):
+        with self._lock:
+            if request_key in self._revalidating:
+                return
+            self._revalidating.add(request_key)
+
+        threading.Thread(
+            target=self._revalidate,
+            args=(request_key, repository_authorization, rasa_version),
+            daemon=True,
+        ).start()
+
+    def _revalidate(self, request_key, repository_authorization, rasa_version):
+        repository_version = request_key[0]
+        try:
+            with self.metrics.timer("backend_update_seconds"):
+                update_request, repository_name, last_training = self._request_update(
+                    repository_version, repository_authorization, rasa_version
+                )
+            validated = self.validated_trainings.get(request_key)
+            if validated and validated["last_training"] != last_training:
+                if self.hot_swap:
+                    self._swap_in_background(
+                        request_key,
+                        update_request,
+                        repository_authorization,
+                        rasa_version,
+                    )
+                else:
+                    # a new training exists, next request reloads the interpreter
+                    self.invalidate(repository_version)
+            else:
+                self._set_validated(request_key, repository_name, last_training)
+        except Exception as e:
+            logger.exception(e)
+            # the next request asks the backend itself and gets the error
+            self._forget_validated(request_key)
+        finally:
+            with self._lock:
+                self._revalidating.discard(request_key)
+
+    def invalidate(self, repository_version):
+        """Forget the validated trainings of a repository version.
+
+        Next request of this version asks the backend for its last training
+        before using the cache.
+        """
+        repository_version = str(repository_version)
+        with self._lock:
+            for request_key in list(self.validated_trainings.keys()):
+                if request_key[0] == repository_version:
+                    del self.validated_trainings[request_key]
+
+    def get_interpreter(
+        self,
+        repository_version,
+        repository_authorization,
+        rasa_version,
+        use_cache=True,
+        count_use=True,
+    ):
+        request_key = self._request_key(repository_version, repository_authorization)
+
+        if use_cache and count_use:
+            self._count_use(request_key)
+
+        if use_cache and self.freshness_ttl:
+            interpreter = self._get_trusted_interpreter(
+                request_key, repository_authorization, rasa_version
+            )
+            if interpreter is not None:
+                return interpreter
+
+        # asked on cache hits too, so it is timed apart from the loads
+        with self.metrics.timer("backend_update_seconds"):
+            update_request, repository_name, last_training = self._request_update(
+                repository_version, repository_authorization, rasa_version
+            )
+
+        if not use_cache:
+            interpreter, model_directory = self._load_interpreter(
+                update_request, repository_version, repository_authorization, rasa_version
+            )
+            if self.model_store is None:
+                remove_directory(model_directory)
+            return interpreter
+
+        # tries to fetch cache, returns it only if it's the same training
+        cached_retrieved = self.cached_interpreters.get(repository_name, last_training)
+        if cached_retrieved:
+            self.metrics.increment("interpreter_cache_hits_total")
+            self._set_validated(request_key, repository_name, last_training)
+            return cached_retrieved["interpreter_data"]
+
+        self.metrics.increment("interpreter_cache_misses_total")
+        stale = self.cached_interpreters.peek(repository_name)
+        if stale is not None:
+            self.metrics.increment(
+                "interpreter_stale_reloads_total", repository=repository_name
+            )
+
+        if self.hot_swap and stale is not None:
+            # read once, a finished swap replaces the entry meanwhile
+            stale_interpreter = stale["interpreter_data"]
+            if stale_interpreter is not None:
+                self._swap_in_background(
+                    request_key, update_request, repository_authorization, rasa_version
+                )
+                return stale_interpreter
+
+        interpreter = self._load_once(
+            (repository_name, last_training),
+            update_request,
+            repository_version,
+            repository_authorization,
+            rasa_version,
+        )
+        self._set_validated(request_key, repository_name, last_training)
+
+        return interpreter
+
+    def _count_use(self, request_key):
+        with self._lock:
+            self.request_uses[request_key] += 1
+            if len(self.request_uses) > REQUEST_USES_MAX_KEYS:
+                self.request_uses = Counter(
+                    dict(self.request_uses.most_common(REQUEST_USES_MAX_KEYS // 2))
+                )
+
+    def _swap_in_background(
+        self, request_key, update_request, repository_authorization, rasa_version
+    ):
+        """Loads a new training in background, replacing the cached one when ready.
+
+        Parses running with the replaced interpreter keep their reference to it,
+        so it is only freed after they finish.
+        """
+        repository_name = (
+            f"{update_request.get('version_id')}_" f"{update_request.get('language')}"
+        )
+        load_key = (repository_name, f"{update_request.get('total_training_end')}")
+
+        with self._lock:
+            if load_key in self._swapping:
+                return
+            self._swapping.add(load_key)
+
+        def swap():
+            try:
+                self._load_once(
+                    load_key,
+                    update_request,
+                    request_key[0],
+                    repository_authorization,
+                    rasa_version,
+                )
+                self._set_validated(request_key, *load_key)
+                logger.info(
+                    f"Swapped interpreter {repository_name} to training {load_key[1]}"
+                )
+            except Exception as e:
+                logger.exception(e)
+                # the previous training is not trusted anymore
+                self._forget_validated(request_key)
+            finally:
+                with self._lock:
+                    self._swapping.discard(load_key)
+
+        threading.Thread(target=swap, daemon=True).start()
+
+    def _load_once(
+        self,
+        load_key,
+        update_request,
+        repository_version,
+        repository_authorization,
+        rasa_version,
+    ):
+        """Loads and caches an interpreter once for concurrent requests.
+
+        The first request of a training loads it, requests arriving while it
+        is loading wait for the same interpreter.
+        """
+        with self._lock:
+            loading = self._loading.get(load_key)
+            if loading is None:
+                loading = Future()
+                self._loading[load_key] = loading
+                is_loader = True
+            else:
+                is_loader = False
+
+        if not is_loader:
+            return loading.result()
+
+        try:
+            # a load of this training may have finished after the cache lookup
+            cached_retrieved = self.cached_interpreters.peek(load_key[0])
+            if cached_retrieved and cached_retrieved["last_training"] == load_key[1]:
+                loading.set_result(cached_retrieved["interpreter_data"])
                 return cached_retrieved["interpreter_data"]
 
+            interpreter, model_directory = self._load_interpreter(
+                update_request, repository_version, repository_authorization, rasa_version
+            )
+            repository_name, last_training = load_key
+            self.cached_interpreters.put(
+                repository_name,
+                interpreter,
+                last_training,
+                size=get_directory_size(model_directory),
+                # models outside the store are removed with their cache entry
+                model_directory=None if self.model_store else model_directory,
+            )
+            # the put may have evicted other repositories
+            self._prune_validated()
+            self.metrics.increment(
+                "interpreter_loads_total", repository=repository_name
+            )
+            self.report_usage()
+            loading.set_result(interpreter)
+        except Exception as e:
+            loading.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._loading[load_key]
+
+        return interpreter
+
+    def _load_interpreter(
+        self, update_request, repository_version, repository_authorization, rasa_version
+    ):
         persistor = BothubPersistor(
             repository_version, repository_authorization, rasa_version
         )
-        model_directory = mkdtemp()
-        persistor.retrieve(str(update_request.get("repository_uuid")), model_directory)
+        model_name = str(update_request.get("repository_uuid"))
 
-        interpreter = BothubInterpreter(
-            None, {"language": update_request.get("language")}
-        )
-        interpreter = interpreter.load(
-            model_directory, components.ComponentBuilder(use_cache=False)
-        )
+        if self.model_store:
+            model_key = ModelStore.model_key(
+                update_request.get("version_id"),
+                update_request.get("language"),
+                update_request.get("total_training_end"),
+            )
+            # the store keeps the model until it is loaded
+            model_directory = self.model_store.acquire(
+                model_key,
+                lambda target_path: persistor.retrieve(model_name, target_path),
+            )
+        else:
+            model_directory = make_temporary_directory()
 
-        # update/creates cache
-        if use_cache:
-            self.cached_interpreters[repository_name] = {
-                "last_training": last_training,
-                "interpreter_data": interpreter,
-            }
+        try:
+            if not self.model_store:
+                persistor.retrieve(model_name, model_directory)
 
-        return interpreter
+            for stage, seconds in persistor.timings.items():
+                self.metrics.timing("interpreter_load_seconds", seconds, stage=stage)
+
+            with self.metrics.timer("interpreter_load_seconds", stage="create"):
+                interpreter = BothubInterpreter(
+                    None, {"language": update_request.get("language")}
+                )
+                interpreter = interpreter.load(
+                    model_directory, shared_component_builder
+                )
+        except Exception:
+            if not self.model_store:
+                remove_directory(model_directory)
+            raise
+        finally:
+            if self.model_store:
+                self.model_store.release(model_key)
+
+        return interpreter, model_directory
+
+    def report_usage(self):
+        """Updates the metrics of resident interpreters and disk usage."""
+        info = self.cached_interpreters.info()
+        with self._lock:
+            evictions = info["evictions"] - self._reported_evictions
+            self._reported_evictions = info["evictions"]
+
+        if evictions:
+            self.metrics.increment("interpreter_cache_evictions_total", evictions)
+        self.metrics.gauge("interpreter_cache_entries", info["entries"])
+        self.metrics.gauge("interpreter_cache_memory_bytes", info["memory"])
+        for location, size in self.disk_usage().items():
+            self.metrics.gauge("disk_usage_bytes", size, location=location)
+
+    def cache_info(self):
+        """Hit, miss and eviction counters and usage of the interpreter cache."""
+        return self.cached_interpreters.info()
+
+    def most_used(self, size):
+        """The `size` most requested (repository_version, repository_authorization)."""
+        with self._lock:
+            return [
+                list(request_key)
+                for request_key, _ in self.request_uses.most_common(size)
+            ]
+
+    def disk_usage(self):
+        """Bytes used on disk by the model store and by temporary model directories."""
+        return {
+            "model_store": self.model_store.size() if self.model_store else 0,
+            "temporary_directories": temporary_directories_usage(),
+        }
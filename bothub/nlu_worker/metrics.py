@@ -0,0 +1,160 @@
+import logging
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+from bothub.nlu_worker import settings
+
+logger = logging.getLogger(__name__)
+
+COUNTER = "counter"
+GAUGE = "gauge"
+TIMING = "timing"
+
+
+def _labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels_key):
+    if not labels_key:
+        return ""
+    labels = ",".join(f'{name}="{value}"' for name, value in labels_key)
+    return f"{{{labels}}}"
+
+
+class Metrics:
+    """Counters, gauges and timings of a worker.
+
+    Every value is kept to be rendered in Prometheus text format and passed
+    to the registered hooks as it is recorded. A hook is called with
+    `(kind, name, value, labels)`, `kind` being one of COUNTER, GAUGE and
+    TIMING, timings in seconds.
+    """
+
+    def __init__(self, prefix="bothub_nlp"):
+        self.prefix = prefix
+        self._counters = {}
+        self._gauges = {}
+        # (name, labels) -> (count, sum of seconds)
+        self._timings = {}
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        self._hooks.append(hook)
+
+    def _notify(self, kind, name, value, labels):
+        for hook in self._hooks:
+            try:
+                hook(kind, name, value, labels)
+            except Exception as e:
+                logger.warning(f"Metrics hook failed: {e}")
+
+    def increment(self, name, value=1, **labels):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._notify(COUNTER, name, value, labels)
+
+    def gauge(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, _labels_key(labels))] = value
+        self._notify(GAUGE, name, value, labels)
+
+    def timing(self, name, seconds, **labels):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            count, total = self._timings.get(key, (0, 0.0))
+            self._timings[key] = (count + 1, total + seconds)
+        self._notify(TIMING, name, seconds, labels)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.timing(name, time.monotonic() - start, **labels)
+
+    def prometheus_text(self):
+        """Recorded values in the Prometheus text exposition format."""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            timings = dict(self._timings)
+
+        lines = []
+
+        def add_family(values, kind, render):
+            names = sorted({name for name, _ in values})
+            for name in names:
+                lines.append(f"# TYPE {self.prefix}_{name} {kind}")
+                for (value_name, labels), value in sorted(values.items()):
+                    if value_name == name:
+                        lines.extend(render(f"{self.prefix}_{name}", labels, value))
+
+        add_family(
+            counters,
+            "counter",
+            lambda name, labels, value: [f"{name}{_format_labels(labels)} {value}"],
+        )
+        add_family(
+            gauges,
+            "gauge",
+            lambda name, labels, value: [f"{name}{_format_labels(labels)} {value}"],
+        )
+        add_family(
+            timings,
+            "summary",
+            lambda name, labels, value: [
+                f"{name}_count{_format_labels(labels)} {value[0]}",
+                f"{name}_sum{_format_labels(labels)} {value[1]}",
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+
+class StatsdHook:
+    """Metrics hook sending the values to a StatsD server over UDP.
+
+    Labels are appended to the metric name, e.g.
+    `bothub_nlp.interpreter_load_seconds.stage.download`.
+    """
+
+    STATSD_TYPES = {COUNTER: "c", GAUGE: "g", TIMING: "ms"}
+
+    def __init__(self, host, port=8125, prefix="bothub_nlp"):
+        self.address = (host, port)
+        self.prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def format(self, kind, name, value, labels):
+        parts = [self.prefix, name]
+        for label, label_value in sorted(labels.items()):
+            parts += [label, str(label_value).replace(".", "_")]
+        if kind == TIMING:
+            value = round(value * 1000, 3)
+        return f"{'.'.join(parts)}:{value}|{self.STATSD_TYPES[kind]}"
+
+    def __call__(self, kind, name, value, labels):
+        try:
+            self._socket.sendto(
+                self.format(kind, name, value, labels).encode(), self.address
+            )
+        except OSError as e:
+            logger.debug(f"Could not send metric to StatsD: {e}")
+
+
+def metrics_from_settings():
+    metrics = Metrics(settings.BOTHUB_NLP_METRICS_PREFIX)
+    if settings.BOTHUB_NLP_METRICS_STATSD_HOST:
+        metrics.add_hook(
+            StatsdHook(
+                settings.BOTHUB_NLP_METRICS_STATSD_HOST,
+                settings.BOTHUB_NLP_METRICS_STATSD_PORT,
+                settings.BOTHUB_NLP_METRICS_PREFIX,
+            )
+        )
+    return metrics
@@ -0,0 +1,88 @@
+import threading
+from concurrent.futures import Future
+
+from bothub.nlu_worker import settings
+
+
+class _Batch:
+    def __init__(self):
+        self.texts = []
+        self.preprocessed_texts = []
+        self.futures = []
+        self.closed = threading.Event()
+
+
+class MicroBatcher:
+    """Gathers concurrent parses of the same interpreter into one batch.
+
+    Only parses requesting the same outputs, and either all giving their
+    preprocessed text or none of them, are gathered together.
+    The first parse of an interpreter waits up to `window` seconds for other
+    parses of that interpreter, or until `max_size` texts are gathered, then
+    runs all of them with `parse_batch` and hands each caller its result.
+    """
+
+    def __init__(self, window, max_size):
+        self.window = window
+        self.max_size = max_size
+        # (id of the interpreter, outputs) -> batch still gathering texts
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        """Micro batcher configured by the settings, or None if disabled."""
+        if not settings.BOTHUB_NLP_MICRO_BATCH_WINDOW:
+            return None
+        return cls(
+            settings.BOTHUB_NLP_MICRO_BATCH_WINDOW / 1000,
+            settings.BOTHUB_NLP_MICRO_BATCH_MAX_SIZE,
+        )
+
+    def parse(self, interpreter, text, outputs=None, preprocessed_text=None):
+        future = Future()
+        # the pending batch keeps a reference to the interpreter, so its id
+        # is not reused while the batch is gathering texts
+        key = (id(interpreter), outputs, preprocessed_text is not None)
+
+        with self._lock:
+            batch = self._pending.get(key)
+            is_leader = batch is None
+            if is_leader:
+                batch = _Batch()
+                self._pending[key] = batch
+            batch.texts.append(text)
+            batch.preprocessed_texts.append(preprocessed_text)
+            batch.futures.append(future)
+
+            if len(batch.texts) >= self.max_size:
+                del self._pending[key]
+                batch.closed.set()
+
+        if is_leader:
+            batch.closed.wait(self.window)
+            with self._lock:
+                if self._pending.get(key) is batch:
+                    del self._pending[key]
+            self._run(interpreter, batch, outputs)
+
+        return future.result()
+
+    @staticmethod
+    def _run(interpreter, batch, outputs):
+        try:
+            if batch.preprocessed_texts[0] is None:
+                results = interpreter.parse_batch(batch.texts, outputs=outputs)
+            else:
+                results = interpreter.parse_batch(
+                    batch.texts,
+                    outputs=outputs,
+                    preprocessed_texts=batch.preprocessed_texts,
+                )
+        except Exception as e:
+            for future in batch.futures:
+                future.set_exception(e)
+            return
+
+        for future, result in zip(batch.futures, results):
+            future.set_result(result)
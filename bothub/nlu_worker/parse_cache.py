@@ -0,0 +1,82 @@
+import copy
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from bothub.nlu_worker import settings
+
+
+class ParseResultCache:
+    """LRU cache of the parse results of each interpreter.
+
+    Results are kept with the interpreter object that produced them, so they
+    are dropped together with an evicted or retrained interpreter. Results
+    older than `ttl` seconds are parsed again, `0` keeps them until evicted.
+    """
+
+    def __init__(self, max_size, ttl=0, metrics=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.metrics = metrics
+
+        self.hits = 0
+        self.misses = 0
+
+        # interpreter -> OrderedDict of key -> (stored_at, result)
+        self._results = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, metrics=None):
+        """Result cache configured by the settings, or None if disabled."""
+        if not settings.BOTHUB_NLP_PARSE_CACHE_SIZE:
+            return None
+        return cls(
+            settings.BOTHUB_NLP_PARSE_CACHE_SIZE,
+            settings.BOTHUB_NLP_PARSE_CACHE_TTL,
+            metrics,
+        )
+
+    def _count(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if self.metrics is not None:
+            self.metrics.increment(
+                "parse_cache_hits_total" if hit else "parse_cache_misses_total"
+            )
+
+    def get(self, interpreter, key):
+        with self._lock:
+            results = self._results.get(interpreter)
+            cached = results.get(key) if results is not None else None
+            if cached is not None and self.ttl and (
+                time.monotonic() - cached[0] > self.ttl
+            ):
+                del results[key]
+                cached = None
+
+            if cached is None:
+                self._count(hit=False)
+                return None
+
+            results.move_to_end(key)
+            self._count(hit=True)
+
+        # callers may change the result they get
+        return copy.deepcopy(cached[1])
+
+    def put(self, interpreter, key, result):
+        result = copy.deepcopy(result)
+        with self._lock:
+            results = self._results.get(interpreter)
+            if results is None:
+                results = OrderedDict()
+                self._results[interpreter] = results
+
+            results[key] = (time.monotonic(), result)
+            results.move_to_end(key)
+            while len(results) > self.max_size:
+                results.popitem(last=False)
@@ -0,0 +1,62 @@
+import copy
+import threading
+from concurrent.futures import Future
+
+from bothub.nlu_worker import settings
+
+
+class ParseCoalescer:
+    """Runs one parse for concurrent requests of the same text.
+
+    The first request of a text parses it, identical requests arriving
+    while it runs wait for its result instead of running the pipeline again.
+    """
+
+    def __init__(self, metrics=None):
+        self.metrics = metrics
+        self.coalesced = 0
+
+        # (id of the interpreter, key) -> Future of the running parse
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, metrics=None):
+        """Coalescer configured by the settings, or None if disabled."""
+        if not settings.BOTHUB_NLP_PARSE_COALESCING:
+            return None
+        return cls(metrics)
+
+    def parse(self, interpreter, key, parse):
+        """Returns `parse()`, or the result of a running parse of the same key."""
+        # the running parse keeps a reference to the interpreter,
+        # so its id is not reused while it is in flight
+        flight_key = (id(interpreter), key)
+
+        with self._lock:
+            running = self._in_flight.get(flight_key)
+            if running is None:
+                running = Future()
+                self._in_flight[flight_key] = running
+                is_leader = True
+            else:
+                self.coalesced += 1
+                is_leader = False
+
+        if not is_leader:
+            if self.metrics is not None:
+                self.metrics.increment("parse_coalesced_total")
+            # each caller gets its own result to change
+            return copy.deepcopy(running.result())
+
+        try:
+            result = parse()
+            running.set_result(result)
+        except Exception as e:
+            running.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[flight_key]
+
+        return result
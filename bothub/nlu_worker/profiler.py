@@ -0,0 +1,64 @@
+import random
+import threading
+from collections import defaultdict
+
+from bothub.nlu_worker import settings
+
+
+class PipelineProfiler:
+    """Aggregates the profile of sampled parses per repository and component.
+
+    A parse is profiled with probability `sample_rate`. Profiled parses run
+    the pipeline by themselves, without result cache, coalescing or
+    micro-batching, so their numbers are not shared with other requests.
+    """
+
+    def __init__(self, sample_rate, metrics=None):
+        self.sample_rate = sample_rate
+        self.metrics = metrics
+
+        # repository_version -> component class -> totals
+        self._stats = defaultdict(
+            lambda: defaultdict(
+                lambda: {"calls": 0, "seconds": 0.0, "allocated_blocks": 0}
+            )
+        )
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, metrics=None):
+        """Profiler configured by the settings, or None if disabled."""
+        if not settings.BOTHUB_NLP_PROFILING_SAMPLE_RATE:
+            return None
+        return cls(settings.BOTHUB_NLP_PROFILING_SAMPLE_RATE, metrics)
+
+    def should_profile(self):
+        return random.random() < self.sample_rate
+
+    def record(self, repository_version, profile):
+        with self._lock:
+            repository_stats = self._stats[str(repository_version)]
+            for component in profile:
+                stats = repository_stats[component["component"]]
+                stats["calls"] += 1
+                stats["seconds"] += component["seconds"]
+                stats["allocated_blocks"] += component["allocated_blocks"]
+
+        if self.metrics is not None:
+            for component in profile:
+                self.metrics.timing(
+                    "component_seconds",
+                    component["seconds"],
+                    component=component["component"],
+                )
+
+    def stats(self):
+        """Totals of each component class, per repository version."""
+        with self._lock:
+            return {
+                repository_version: {
+                    component: dict(stats)
+                    for component, stats in repository_stats.items()
+                }
+                for repository_version, repository_stats in self._stats.items()
+            }
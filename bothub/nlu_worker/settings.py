@@ -0,0 +1,83 @@
+import os
+import tempfile
+
+from decouple import config
+
+# Interpreter cache
+BOTHUB_NLP_INTERPRETER_CACHE_MAX_ENTRIES = config(
+    "BOTHUB_NLP_INTERPRETER_CACHE_MAX_ENTRIES", default=20, cast=int
+)
+BOTHUB_NLP_INTERPRETER_CACHE_MAX_MEMORY = config(
+    "BOTHUB_NLP_INTERPRETER_CACHE_MAX_MEMORY", default=0, cast=int
+)
+BOTHUB_NLP_INTERPRETER_CACHE_POLICY = config(
+    "BOTHUB_NLP_INTERPRETER_CACHE_POLICY", default="lru"
+)
+BOTHUB_NLP_INTERPRETER_FRESHNESS_TTL = config(
+    "BOTHUB_NLP_INTERPRETER_FRESHNESS_TTL", default=0, cast=float
+)
+BOTHUB_NLP_INTERPRETER_HOT_SWAP = config(
+    "BOTHUB_NLP_INTERPRETER_HOT_SWAP", default=False, cast=bool
+)
+
+# Local store of extracted models
+BOTHUB_NLP_MODEL_STORE_DIR = config(
+    "BOTHUB_NLP_MODEL_STORE_DIR",
+    default=os.path.join(tempfile.gettempdir(), "bothub-model-store"),
+)
+BOTHUB_NLP_MODEL_STORE_MAX_SIZE = config(
+    "BOTHUB_NLP_MODEL_STORE_MAX_SIZE", default=2 * 1024 ** 3, cast=int
+)
+
+# Interpreters loaded before the worker starts consuming
+BOTHUB_NLP_WARMUP_REPOSITORIES = config("BOTHUB_NLP_WARMUP_REPOSITORIES", default="")
+BOTHUB_NLP_WARMUP_SNAPSHOT = config("BOTHUB_NLP_WARMUP_SNAPSHOT", default="")
+BOTHUB_NLP_WARMUP_SNAPSHOT_SIZE = config(
+    "BOTHUB_NLP_WARMUP_SNAPSHOT_SIZE", default=10, cast=int
+)
+BOTHUB_NLP_WARMUP_TIMEOUT = config("BOTHUB_NLP_WARMUP_TIMEOUT", default=120, cast=float)
+
+# Metrics
+BOTHUB_NLP_METRICS_PREFIX = config("BOTHUB_NLP_METRICS_PREFIX", default="bothub_nlp")
+BOTHUB_NLP_METRICS_STATSD_HOST = config("BOTHUB_NLP_METRICS_STATSD_HOST", default="")
+BOTHUB_NLP_METRICS_STATSD_PORT = config(
+    "BOTHUB_NLP_METRICS_STATSD_PORT", default=8125, cast=int
+)
+
+# Micro-batching of concurrent parses, a window of 0 disables it
+BOTHUB_NLP_MICRO_BATCH_WINDOW = config(
+    "BOTHUB_NLP_MICRO_BATCH_WINDOW", default=0, cast=float
+)
+BOTHUB_NLP_MICRO_BATCH_MAX_SIZE = config(
+    "BOTHUB_NLP_MICRO_BATCH_MAX_SIZE", default=5, cast=int
+)
+
+# Parse results kept per interpreter, a size of 0 disables the cache
+BOTHUB_NLP_PARSE_CACHE_SIZE = config(
+    "BOTHUB_NLP_PARSE_CACHE_SIZE", default=1000, cast=int
+)
+BOTHUB_NLP_PARSE_CACHE_TTL = config("BOTHUB_NLP_PARSE_CACHE_TTL", default=60, cast=float)
+
+# Preprocessed phrases kept per language, a size of 0 disables the cache
+BOTHUB_NLP_PREPROCESSING_CACHE_SIZE = config(
+    "BOTHUB_NLP_PREPROCESSING_CACHE_SIZE", default=10000, cast=int
+)
+
+# Concurrent parses of the same text run the pipeline once
+BOTHUB_NLP_PARSE_COALESCING = config(
+    "BOTHUB_NLP_PARSE_COALESCING", default=True, cast=bool
+)
+
+# Fraction of the parses profiled per pipeline component, 0 disables profiling
+BOTHUB_NLP_PROFILING_SAMPLE_RATE = config(
+    "BOTHUB_NLP_PROFILING_SAMPLE_RATE", default=0, cast=float
+)
+
+# HTTP parse server embedded in the worker, a port of 0 disables it.
+# It has no authentication, listening beyond localhost must be deliberate
+BOTHUB_NLP_HTTP_HOST = config("BOTHUB_NLP_HTTP_HOST", default="127.0.0.1")
+BOTHUB_NLP_HTTP_PORT = config("BOTHUB_NLP_HTTP_PORT", default=0, cast=int)
+BOTHUB_NLP_HTTP_WORKERS = config("BOTHUB_NLP_HTTP_WORKERS", default=5, cast=int)
+BOTHUB_NLP_HTTP_MAX_PENDING = config(
+    "BOTHUB_NLP_HTTP_MAX_PENDING", default=50, cast=int
+)
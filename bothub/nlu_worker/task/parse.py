@@ -1,6 +1,8 @@
 from collections import OrderedDict
 from rasa.nlu import __version__ as rasa_version
 
+from bothub.shared.utils.rasa_components.bothub_interpreter import normalize_outputs
+
 
 def format_parse_output(
     repository_version, r, repository_authorization
@@ -30,13 +32,86 @@ def parse_text(
     text,
     rasa_format=False,
     use_cache=True,
+    micro_batcher=None,
+    result_cache=None,
+    coalescer=None,
+    profiler=None,
+    debug=False,
+    outputs=None,
+):
+    # outputs lists the results needed, "intent" and/or "entities"
+    outputs = normalize_outputs(outputs)
+    interpreter = interpreter_manager.get_interpreter(
+        repository_version, repository_authorization, rasa_version, use_cache
+    )
+
+    if debug or (profiler is not None and profiler.should_profile()):
+        profile = []
+        r = interpreter.parse(text, profile=profile, outputs=outputs)
+        if profiler is not None:
+            profiler.record(repository_version, profile)
+
+        if rasa_format:
+            out = r
+        else:
+            out = format_parse_output(repository_version, r, repository_authorization)
+        if debug:
+            out["profile"] = profile
+        return out
+
+    preprocessed_text = None
+    if use_cache and (result_cache is not None or coalescer is not None):
+        # the interpreter identifies the repository version and its training,
+        # the parse reuses the preprocessed text instead of preprocessing again
+        preprocessed_text = interpreter.preprocess(text)
+
+    if use_cache and result_cache is not None:
+        result_key = (preprocessed_text, bool(rasa_format), outputs)
+        cached = result_cache.get(interpreter, result_key)
+        if cached is not None:
+            return cached
+
+    def parse():
+        if micro_batcher is not None:
+            return micro_batcher.parse(interpreter, text, outputs, preprocessed_text)
+        return interpreter.parse(
+            text, outputs=outputs, preprocessed_text=preprocessed_text
+        )
+
+    if use_cache and coalescer is not None:
+        r = coalescer.parse(interpreter, (preprocessed_text, outputs), parse)
+    else:
+        r = parse()
+
+    if rasa_format:
+        out = r
+    else:
+        out = format_parse_output(repository_version, r, repository_authorization)
+
+    if use_cache and result_cache is not None:
+        result_cache.put(interpreter, result_key, out)
+
+    return out
+
+
+def parse_text_batch(
+    repository_version,
+    repository_authorization,
+    interpreter_manager,
+    texts,
+    rasa_format=False,
+    use_cache=True,
+    outputs=None,
 ):
     interpreter = interpreter_manager.get_interpreter(
         repository_version, repository_authorization, rasa_version, use_cache
     )
-    r = interpreter.parse(text)
+    results = interpreter.parse_batch(texts, outputs=normalize_outputs(outputs))
 
     if rasa_format:
-        return r
+        return results
 
-    return format_parse_output(repository_version, r, repository_authorization)
+    return [
+        format_parse_output(repository_version, r, repository_authorization)
+        for r in results
+    ]
@@ -0,0 +1,109 @@
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from rasa.nlu import __version__ as rasa_version
+
+logger = logging.getLogger(__name__)
+
+
+def parse_warmup_repositories(value):
+    """Parses a `repository_version:repository_authorization|...` list.
+
+    :param value: string in the format of BOTHUB_NLP_WARMUP_REPOSITORIES
+    :return: list of (repository_version, repository_authorization)
+    """
+    repositories = []
+    for item in value.split("|"):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            repository_version, repository_authorization = item.split(":", 1)
+        except ValueError:
+            logger.warning(f"Ignoring invalid warm-up repository '{item}'")
+            continue
+        repositories.append((repository_version, repository_authorization))
+    return repositories
+
+
+def load_snapshot(path):
+    """Repositories saved by `save_snapshot`, or an empty list."""
+    try:
+        with open(path, "r") as snapshot_file:
+            return [tuple(repository) for repository in json.load(snapshot_file)]
+    except (OSError, ValueError) as e:
+        logger.info(f"No warm-up snapshot loaded from {path}: {e}")
+        return []
+
+
+def save_snapshot(path, interpreter_manager, size):
+    """Saves the `size` most used repositories of `interpreter_manager`.
+
+    The snapshot holds repository authorizations, so it is readable only by
+    its owner. It is written to a temporary file replacing the previous
+    snapshot when complete.
+    """
+    repositories = interpreter_manager.most_used(size)
+    # mkstemp creates the file with mode 0o600
+    fd, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), prefix=".warmup-snapshot-"
+    )
+    try:
+        with os.fdopen(fd, "w") as snapshot_file:
+            json.dump(repositories, snapshot_file)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+    logger.info(f"Saved {len(repositories)} repositories to warm-up snapshot")
+
+
+def warm_up(interpreter_manager, repositories, timeout, workers=2):
+    """Loads the interpreters of `repositories` into `interpreter_manager`.
+
+    Returns after every interpreter is loaded or when `timeout` seconds pass.
+    Interpreters not loaded by then are skipped, so they are loaded by their
+    first parse as usual.
+
+    :return: number of interpreters loaded
+    """
+    repositories = list(dict.fromkeys(repositories))
+    if not repositories:
+        return 0
+
+    logger.info(f"Warming up {len(repositories)} interpreters")
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = [
+        executor.submit(
+            interpreter_manager.get_interpreter,
+            repository_version,
+            repository_authorization,
+            rasa_version,
+            # warm-up loads are not requests, they would favour themselves in
+            # the next snapshot
+            count_use=False,
+        )
+        for repository_version, repository_authorization in repositories
+    ]
+    done, not_done = wait(futures, timeout=timeout or None)
+
+    for future in not_done:
+        future.cancel()
+    # loads already running finish in background and fill the cache
+    executor.shutdown(wait=False)
+
+    loaded = 0
+    for future in done:
+        if future.exception() is not None:
+            logger.warning(f"Could not warm up interpreter: {future.exception()}")
+        else:
+            loaded += 1
+
+    logger.info(
+        f"Warm-up loaded {loaded} of {len(repositories)} interpreters"
+        + (" before timing out" if not_done else "")
+    )
+    return loaded
@@ -6,7 +6,6 @@ from _collections import defaultdict
 from typing import List, Text, Set
 
 from rasa.nlu.model import Trainer
-from rasa.nlu.components import ComponentBuilder
 
 from rasa.nlu.test import (
     merge_labels,
@@ -36,6 +35,9 @@ from bothub.shared.utils.backend import backend
 from bothub.shared.utils.pipeline_builder import PipelineBuilder
 from bothub.shared.utils.poke_logging import PokeLogging
 from bothub.shared.utils.helpers import get_examples_request
+from bothub.shared.utils.rasa_components.component_builder import (
+    shared_component_builder,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -428,7 +430,7 @@ def evaluate_crossval_update(
             pipeline_builder = PipelineBuilder(update_request)
             pipeline_builder.print_pipeline()
             rasa_nlu_config = pipeline_builder.get_nlu_model()
-            trainer = Trainer(rasa_nlu_config, ComponentBuilder(use_cache=False))
+            trainer = Trainer(rasa_nlu_config, shared_component_builder)
 
             result = {
                 "intent_evaluation": None,
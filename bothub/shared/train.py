@@ -1,16 +1,19 @@
-from tempfile import mkdtemp
 import os
 import logging
+import tempfile
 from rasa.nlu import __version__ as rasa_version
 from rasa.nlu.model import Trainer
 from rasa.nlu.training_data import Message, TrainingData
-from rasa.nlu.components import ComponentBuilder
 
 from bothub.shared.utils.poke_logging import PokeLogging
 from bothub.shared.utils.backend import backend
 from bothub.shared.utils.helpers import get_examples_request
 from bothub.shared.utils.persistor import BothubPersistor
 from bothub.shared.utils.pipeline_builder import PipelineBuilder
+from bothub.shared.utils.rasa_components.component_builder import (
+    shared_component_builder,
+)
+from bothub.shared.utils.temporary_directories import temporary_directory_prefix
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +48,19 @@ def load_lookup_tables(update_request):
     return lookup_tables
 
 
+def notify_training_end(repository_version):
+    """Tell running workers to stop trusting their cached training of this version."""
+    try:
+        from bothub_nlp_celery.app import celery_app
+
+        celery_app.control.broadcast(
+            "invalidate_interpreter",
+            arguments={"repository_version": repository_version},
+        )
+    except Exception as e:
+        logger.warning(f"Could not notify workers about the new training: {e}")
+
+
 def train_update(
     repository_version, by, repository_authorization, from_queue="celery"
 ):  # pragma: no cover
@@ -104,7 +120,7 @@ def train_update(
             pipeline_builder = PipelineBuilder(update_request)
             pipeline_builder.print_pipeline()
             rasa_nlu_config = pipeline_builder.get_nlu_model()
-            trainer = Trainer(rasa_nlu_config, ComponentBuilder(use_cache=False))
+            trainer = Trainer(rasa_nlu_config, shared_component_builder)
             training_data = TrainingData(
                 training_examples=examples, lookup_tables=lookup_tables
             )
@@ -114,13 +130,17 @@ def train_update(
             persistor = BothubPersistor(
                 repository_version, repository_authorization, rasa_version
             )
-            trainer.persist(
-                mkdtemp(),
-                persistor=persistor,
-                fixed_model_name=f"{update_request.get('repository_version')}_"
-                f"{update_request.get('total_training_end') + 1}_"
-                f"{update_request.get('language')}",
-            )
+            with tempfile.TemporaryDirectory(
+                prefix=temporary_directory_prefix()
+            ) as model_directory:
+                trainer.persist(
+                    model_directory,
+                    persistor=persistor,
+                    fixed_model_name=f"{update_request.get('repository_version')}_"
+                    f"{update_request.get('total_training_end') + 1}_"
+                    f"{update_request.get('language')}",
+                )
+            notify_training_end(repository_version)
         except Exception as e:
             logger.exception(e)
             backend().request_backend_trainfail_nlu(
@@ -1,3 +1,5 @@
+import os
+
 from bothub.shared.utils.backend import backend
 
 
@@ -57,3 +59,14 @@ def choose_best_algorithm(language):
 
     # default algorithm
     return supported_algorithms[len(supported_algorithms) - 1]["name"]
+
+
+def get_directory_size(path):
+    """Sum of the sizes, in bytes, of all files under `path`."""
+    size = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            file_path = os.path.join(dirpath, filename)
+            if not os.path.islink(file_path):
+                size += os.path.getsize(file_path)
+    return size
@@ -0,0 +1,154 @@
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import Counter
+
+from bothub.shared.utils.helpers import get_directory_size
+from bothub.shared.utils.temporary_directories import is_process_running
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_PREFIX = ".partial-"
+
+
+class ModelStore:
+    """Local store of extracted models keyed by version, language and training.
+
+    A model is extracted into a temporary directory inside the store and
+    renamed to its final path only when complete, so a path returned by the
+    store always holds a whole model. When the store grows over `max_size`
+    bytes the least recently used models are removed, except the ones
+    acquired by this process and the ones used in the last `in_use_seconds`,
+    which other processes sharing the store may be loading.
+    """
+
+    def __init__(self, directory, max_size=0, in_use_seconds=60):
+        self.directory = directory
+        self.max_size = max_size
+        self.in_use_seconds = in_use_seconds
+        self._lock = threading.Lock()
+        # model key -> loads of the model running in this process
+        self._acquired = Counter()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._remove_partials()
+
+    @staticmethod
+    def model_key(version_id, language, total_training_end):
+        return f"{version_id}_{language}_{total_training_end}"
+
+    def path(self, model_key):
+        return os.path.join(self.directory, model_key)
+
+    def get(self, model_key):
+        """Returns the directory of a stored model, or None if it isn't stored."""
+        model_path = self.path(model_key)
+        try:
+            # the modification time of a model tracks its last use
+            os.utime(model_path)
+        except OSError:
+            return None
+        return model_path
+
+    def retrieve(self, model_key, fetch):
+        """Returns the directory of a model, calling `fetch` to extract it if needed.
+
+        :param model_key: key created by `model_key`
+        :param fetch: callable receiving the directory the model must be
+            extracted into
+        """
+        model_path = self.get(model_key)
+        if model_path:
+            logger.info(f"Loading model {model_key} from local store")
+            return model_path
+
+        partial_path = os.path.join(
+            self.directory, f"{PARTIAL_PREFIX}{os.getpid()}-{uuid.uuid4()}"
+        )
+        try:
+            fetch(partial_path)
+            os.rename(partial_path, self.path(model_key))
+        except OSError:
+            if not os.path.isdir(self.path(model_key)):
+                raise
+            # another process stored the same model meanwhile
+        finally:
+            shutil.rmtree(partial_path, ignore_errors=True)
+
+        self.cleanup(keep=model_key)
+        return self.path(model_key)
+
+    def acquire(self, model_key, fetch):
+        """Same as `retrieve`, keeping the model in the store until `release`."""
+        with self._lock:
+            self._acquired[model_key] += 1
+        try:
+            return self.retrieve(model_key, fetch)
+        except Exception:
+            self.release(model_key)
+            raise
+
+    def release(self, model_key):
+        with self._lock:
+            self._acquired[model_key] -= 1
+            if self._acquired[model_key] <= 0:
+                del self._acquired[model_key]
+
+    def models(self):
+        """Stored model keys, from the least to the most recently used."""
+        return [model_key for _, model_key in self._models_used_at()]
+
+    def _models_used_at(self):
+        """(last use, model key) of the stored models, least recently used first."""
+        models = []
+        for model_key in os.listdir(self.directory):
+            if model_key.startswith(PARTIAL_PREFIX):
+                continue
+            try:
+                models.append((os.path.getmtime(self.path(model_key)), model_key))
+            except OSError:
+                continue
+        return sorted(models)
+
+    def size(self):
+        return get_directory_size(self.directory)
+
+    def cleanup(self, keep=None):
+        """Removes the least recently used models while the store is over its size."""
+        if not self.max_size:
+            return
+
+        with self._lock:
+            models = self._models_used_at()
+            sizes = {
+                model_key: get_directory_size(self.path(model_key))
+                for _, model_key in models
+            }
+            total_size = sum(sizes.values())
+            in_use_since = time.time() - self.in_use_seconds
+
+            for used_at, model_key in models:
+                if total_size <= self.max_size:
+                    break
+                if (
+                    model_key == keep
+                    or model_key in self._acquired
+                    or used_at > in_use_since
+                ):
+                    continue
+                logger.info(f"Removing model {model_key} from local store")
+                shutil.rmtree(self.path(model_key), ignore_errors=True)
+                total_size -= sizes[model_key]
+
+    def _remove_partials(self):
+        """Removes extractions interrupted by processes that are not running anymore."""
+        for name in os.listdir(self.directory):
+            if not name.startswith(PARTIAL_PREFIX):
+                continue
+            pid = name[len(PARTIAL_PREFIX):].split("-", 1)[0]
+            if pid.isdigit() and is_process_running(int(pid)):
+                continue
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
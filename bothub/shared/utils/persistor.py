@@ -1,12 +1,61 @@
 import base64
+import io
+import os
+import tarfile
+import time
 import bothub_backend
 import argparse
-from tempfile import NamedTemporaryFile
 
 import requests
 from rasa.nlu.persistor import Persistor
 from decouple import config
 
+# size of the base64 slices decoded at once, a multiple of 4
+BASE64_CHUNK_SIZE = 4 * 64 * 1024
+
+
+class Base64Reader(io.RawIOBase):
+    """Readable file object decoding base64 data incrementally.
+
+    Only a slice of the decoded data is held in memory at a time, so large
+    models can be streamed straight into tar extraction.
+    """
+
+    def __init__(self, data, chunk_size=BASE64_CHUNK_SIZE):
+        super().__init__()
+        self.data = data
+        self.chunk_size = chunk_size
+        self.position = 0
+        self.pending = b""
+        self.decoded = bytearray()
+
+    def readable(self):
+        return True
+
+    def _decode_chunk(self):
+        chunk = self.data[self.position : self.position + self.chunk_size]
+        self.position += self.chunk_size
+        if isinstance(chunk, str):
+            chunk = chunk.encode("ascii")
+
+        # whitespace would break the 4 characters alignment of base64
+        chunk = self.pending + b"".join(chunk.split())
+        usable = len(chunk) - len(chunk) % 4
+        self.pending = chunk[usable:]
+        self.decoded += base64.b64decode(chunk[:usable])
+
+    def readinto(self, buffer):
+        while len(self.decoded) < len(buffer) and self.position < len(self.data):
+            self._decode_chunk()
+
+        if self.position >= len(self.data) and self.pending:
+            raise ValueError("Incorrect padding in base64 data")
+
+        size = min(len(buffer), len(self.decoded))
+        buffer[:size] = self.decoded[:size]
+        del self.decoded[:size]
+        return size
+
 
 class BothubPersistor(Persistor):
     def __init__(
@@ -21,6 +70,8 @@ class BothubPersistor(Persistor):
         self.repository_version = repository_version
         self.repository_authorization = repository_authorization
         self.rasa_version = rasa_version
+        # seconds spent by the last retrieve downloading and extracting the model
+        self.timings = {}
 
     def backend(self):
         PARSER = argparse.ArgumentParser()
@@ -40,30 +91,51 @@ class BothubPersistor(Persistor):
         )
 
     def _persist_tar(self, filekey, tarname):
-        with open(tarname, "rb") as tar_file:
-            data = tar_file.read()
+        try:
+            with open(tarname, "rb") as tar_file:
+                data = tar_file.read()
 
-            self.backend().send_training_backend_nlu_persistor(
-                self.repository_version,
-                data,
-                self.repository_authorization,
-                self.rasa_version,
-            )
+                self.backend().send_training_backend_nlu_persistor(
+                    self.repository_version,
+                    data,
+                    self.repository_authorization,
+                    self.rasa_version,
+                )
+        finally:
+            # the tar and its directory are created by Persistor._compress
+            os.remove(tarname)
+            try:
+                os.rmdir(os.path.dirname(tarname))
+            except OSError:
+                pass
 
-    def retrieve(self, model_name, target_path):
-        tar_name = self._tar_name(model_name)
+    @staticmethod
+    def _decompress_stream(fileobj, target_path):
+        """Extracts a tar.gz while it is read, without saving it to disk."""
+        with tarfile.open(fileobj=fileobj, mode="r|gz") as tar:
+            tar.extractall(target_path)  # target dir will be created if it not exists
 
+    def retrieve(self, model_name, target_path):
+        # the model is extracted while it is downloaded, so "download" is the
+        # time until the data starts arriving and "extraction" the rest
+        start = time.monotonic()
         train = self.backend().request_backend_parse_nlu_persistor(
             self.repository_version, self.repository_authorization, self.rasa_version
         )
 
         if train.get("from_aws"):
-            tar_data = requests.get(train.get("bot_data")).content
-        else:
-            tar_data = base64.b64decode(train.get("bot_data"))  # pragma: no cover
+            with requests.get(train.get("bot_data"), stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                self.timings["download"] = time.monotonic() - start
 
-        tar_file = NamedTemporaryFile(suffix=tar_name, delete=False)
-        tar_file.write(tar_data)
-        tar_file.close()
+                start = time.monotonic()
+                self._decompress_stream(response.raw, target_path)
+        else:
+            self.timings["download"] = time.monotonic() - start
 
-        self._decompress(tar_file.name, target_path)
+            start = time.monotonic()
+            self._decompress_stream(
+                Base64Reader(train.get("bot_data")), target_path
+            )  # pragma: no cover
+        self.timings["extraction"] = time.monotonic() - start
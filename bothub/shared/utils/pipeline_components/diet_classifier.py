@@ -1,7 +1,9 @@
+from typing import Any, Dict, List, Optional, Text
+
 import rasa.utils.common as common_utils
 from rasa.nlu.classifiers.diet_classifier import DIETClassifier
 from rasa.constants import DOCS_URL_TRAINING_DATA_NLU
-from rasa.nlu.training_data import TrainingData
+from rasa.nlu.training_data import Message, TrainingData
 from rasa.nlu.constants import (
     ENTITIES,
     TOKENS_NAMES,
@@ -10,6 +12,10 @@ from rasa.nlu.constants import (
     ENTITY_ATTRIBUTE_END,
     INTENT,
 )
+from rasa.utils.tensorflow.constants import ENTITY_RECOGNITION, INTENT_CLASSIFICATION
+
+# messages predicted by a single forward pass of the model in process_batch
+PREDICT_BATCH_SIZE = 64
 
 
 class DIETClassifierCustom(DIETClassifier):
@@ -45,3 +51,79 @@ class DIETClassifierCustom(DIETClassifier):
                         docs=DOCS_URL_TRAINING_DATA_NLU,
                     )
                     break
+
+    def _predict_batch(self, messages: List[Message]) -> List[Optional[Dict[Text, Any]]]:
+        """Predicts the messages with a forward pass of the model for every
+        PREDICT_BATCH_SIZE messages.
+
+        Returns the output of each message as `_predict` would return it.
+        """
+        # RasaModel.predict only runs a batch of one message, batches go through
+        # the prediction function it builds
+        if self.model is None or not hasattr(self.model, "_predict_function"):
+            return [self._predict(message) for message in messages]
+
+        outputs = []
+        for start in range(0, len(messages), PREDICT_BATCH_SIZE):
+            outputs.extend(
+                self._predict_chunk(messages[start : start + PREDICT_BATCH_SIZE])
+            )
+        return outputs
+
+    def _predict_chunk(self, messages: List[Message]) -> List[Dict[Text, Any]]:
+        model_data = self._create_model_data(messages, training=False)
+        if self.model._predict_function is None:
+            self.model.build_for_predict(model_data)
+
+        self.model._training = False  # needed for eager mode
+        batch_out = self.model._predict_function(
+            model_data.prepare_batch(start=0, end=len(messages))
+        )
+
+        outputs = []
+        for index, message in enumerate(messages):
+            sequence_length = len(message.get(TOKENS_NAMES[TEXT], []))
+            out = {}
+            for name, values in batch_out.items():
+                if name.startswith("e_") and name.endswith("_ids"):
+                    # drop the tags predicted for the padding of shorter messages
+                    out[name] = values[index : index + 1, :sequence_length]
+                else:
+                    out[name] = values[index : index + 1]
+            outputs.append(out)
+        return outputs
+
+    def _set_predictions(
+        self,
+        message: Message,
+        out: Optional[Dict[Text, Any]],
+        outputs: Optional[List[Text]] = None,
+    ) -> None:
+        """Decodes the labels and entities of `out` requested by `outputs`."""
+
+        if self.component_config[INTENT_CLASSIFICATION] and (
+            outputs is None or INTENT in outputs
+        ):
+            label, label_ranking = self._predict_label(out)
+
+            message.set(INTENT, label, add_to_output=True)
+            message.set("intent_ranking", label_ranking, add_to_output=True)
+
+        if self.component_config[ENTITY_RECOGNITION] and (
+            outputs is None or ENTITIES in outputs
+        ):
+            entities = self._predict_entities(out, message)
+
+            message.set(ENTITIES, entities, add_to_output=True)
+
+    def process(self, message: Message, **kwargs: Any) -> None:
+        """Return the most likely label and its similarity to the input."""
+
+        out = self._predict(message)
+        self._set_predictions(message, out, kwargs.get("parse_outputs"))
+
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+        """Return the most likely label of each message and its similarity."""
+
+        for message, out in zip(messages, self._predict_batch(messages)):
+            self._set_predictions(message, out, kwargs.get("parse_outputs"))
@@ -1,13 +1,18 @@
 import logging
 from typing import Any, Dict, List, Text, Tuple, Optional
 
+from rasa.nlu.constants import LANGUAGE_MODEL_DOCS, TEXT
 from rasa.nlu.tokenizers.whitespace_tokenizer import WhitespaceTokenizer
+from rasa.nlu.training_data import Message
 import numpy as np
 
 from rasa.nlu.utils.hugging_face.hf_transformers import HFTransformersNLP
 
 logger = logging.getLogger(__name__)
 
+# messages fed to the language model at once by process_batch
+PROCESS_BATCH_SIZE = 64
+
 
 class HFTransformersNLPCustom(HFTransformersNLP):
     """Utility Component for interfacing between Transformers library and Rasa OS.
@@ -23,6 +28,29 @@ class HFTransformersNLPCustom(HFTransformersNLP):
         self._load_model()
         self.whitespace_tokenizer = WhitespaceTokenizer()
 
+    @classmethod
+    def cache_key(
+        cls, component_meta: Dict[Text, Any], model_metadata: "Metadata"
+    ) -> Optional[Text]:
+        # pipelines using the same language model share one loaded instance
+        model_name = component_meta.get("model_name", cls.defaults["model_name"])
+        model_weights = component_meta.get("model_weights") or ""
+
+        return f"{cls.name}-{model_name}-{model_weights}"
+
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+        """Compute tokens and dense features of a batch of incoming messages.
+
+        The language model runs once for every PROCESS_BATCH_SIZE messages
+        instead of once per message.
+        """
+        for start in range(0, len(messages), PROCESS_BATCH_SIZE):
+            batch_messages = messages[start : start + PROCESS_BATCH_SIZE]
+            batch_docs = self._get_docs_for_batch(batch_messages, attribute=TEXT)
+
+            for message, doc in zip(batch_messages, batch_docs):
+                message.set(LANGUAGE_MODEL_DOCS[TEXT], doc)
+
     def _load_model(self) -> None:
         """Try loading the model"""
 
@@ -0,0 +1,145 @@
+import re
+import string
+from collections import deque
+from functools import lru_cache
+from typing import List, Text, Tuple
+
+# version of the attributes of LookupMatcher, persisted models with matchers of
+# another version rebuild them from the elements
+LOOKUP_MATCHER_VERSION = 1
+
+
+@lru_cache(maxsize=4096)
+def fold_char(char: Text) -> Text:
+    """ASCII letter a non ASCII character matches with re.IGNORECASE, if any."""
+    for letter in string.ascii_lowercase:
+        if re.match(letter, char, re.IGNORECASE):
+            return letter
+    return char
+
+
+def fold_text(text: Text) -> Text:
+    """Text whose characters are equal to the ASCII characters they match with
+    re.IGNORECASE, character by character."""
+    if all(ord(char) < 128 for char in text):
+        return text.lower()
+    # lower() may change the length of non ASCII text
+    return "".join(
+        char.lower() if ord(char) < 128 else fold_char(char) for char in text
+    )
+
+
+def is_word_char(char: Text) -> bool:
+    # the word characters of \b in str patterns
+    return char.isalnum() or char == "_"
+
+
+class LookupMatcher:
+    """Aho-Corasick automaton of the elements of a lookup table.
+
+    It finds the same matches as `re.finditer` with the regex
+    `(\\belement\\b|\\belement\\b|...)` of the table: at each position, the
+    first element of the table matching there between word boundaries, then
+    the search goes on after its end. Matching takes time proportional to the
+    length of the text and the elements found, not to the size of the table.
+    Only non empty ASCII elements are supported, see `supports`.
+    """
+
+    def __init__(self, elements: List[Text], case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+
+        # the automaton, with the root at node 0
+        # node -> {character: next node}
+        self.transitions = [{}]
+        # node -> (index, length) of the first element ending at the node
+        self.outputs = [None]
+        # node -> node of its longest proper suffix in the automaton
+        self.failures = [0]
+        # node -> closest node with an output following the failures, 0 if none
+        self.output_links = [0]
+
+        for index, element in enumerate(elements):
+            node = 0
+            for char in self._fold(element):
+                next_node = self.transitions[node].get(char)
+                if next_node is None:
+                    next_node = len(self.transitions)
+                    self.transitions[node][char] = next_node
+                    self.transitions.append({})
+                    self.outputs.append(None)
+                    self.failures.append(0)
+                    self.output_links.append(0)
+                node = next_node
+            if self.outputs[node] is None:
+                self.outputs[node] = (index, len(element))
+
+        self._link()
+
+    @staticmethod
+    def supports(elements: List[Text]) -> bool:
+        return all(
+            element and all(ord(char) < 128 for char in element)
+            for element in elements
+        )
+
+    def _fold(self, text: Text) -> Text:
+        return text if self.case_sensitive else fold_text(text)
+
+    def _link(self):
+        """Sets the failures and output links, breadth first."""
+        queue = deque(self.transitions[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self.transitions[node].items():
+                failure = self.failures[node]
+                while failure and char not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                failure = self.transitions[failure].get(char, 0)
+
+                self.failures[next_node] = failure
+                self.output_links[next_node] = (
+                    failure
+                    if self.outputs[failure] is not None
+                    else self.output_links[failure]
+                )
+                queue.append(next_node)
+
+    def _first_elements(self, text: Text) -> dict:
+        """start -> (index, end) of the first element matching at each start."""
+        words = [is_word_char(char) for char in text]
+        words.append(False)
+
+        def is_boundary(position):
+            before = words[position - 1] if position else False
+            return before != words[position]
+
+        first_elements = {}
+        node = 0
+        for position, char in enumerate(self._fold(text)):
+            while node and char not in self.transitions[node]:
+                node = self.failures[node]
+            node = self.transitions[node].get(char, 0)
+
+            output = node if self.outputs[node] is not None else self.output_links[node]
+            end = position + 1
+            while output:
+                index, length = self.outputs[output]
+                start = end - length
+                if is_boundary(start) and is_boundary(end):
+                    first = first_elements.get(start)
+                    if first is None or index < first[0]:
+                        first_elements[start] = (index, end)
+                output = self.output_links[output]
+
+        return first_elements
+
+    def finditer(self, text: Text) -> List[Tuple[int, int]]:
+        """(start, end) of the elements found in the text, in order."""
+        spans = []
+        last_end = 0
+        first_elements = self._first_elements(text)
+        for start in sorted(first_elements):
+            if start >= last_end:
+                last_end = first_elements[start][1]
+                spans.append((start, last_end))
+        return spans
@@ -0,0 +1,97 @@
+import re
+from typing import List, Text, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# patterns scanned together by each combined regex
+COMBINED_PATTERNS_MAX = 500
+
+# patterns referring to their own groups or setting global flags, which change
+# meaning once put together with other patterns
+UNCOMBINABLE_PATTERN_REGEX = re.compile(r"\\[1-9]|\(\?P[<=]|\(\?\(|\(\?[aiLmsux]+\)")
+
+
+def can_match_empty(compiled) -> bool:
+    return sre_parse.parse(compiled.pattern, compiled.flags).getwidth()[0] == 0
+
+
+class PatternMatcher:
+    """Finds the matches of many regex patterns with a few scans of the text.
+
+    The patterns are compiled once and merged into combined regexes of up to
+    COMBINED_PATTERNS_MAX patterns. Each combined regex searches for the next
+    position where any of its patterns match, then a single match at that
+    position captures every pattern matching there, each in a named group.
+    The matches of each pattern are the ones `re.finditer` gives. Patterns
+    that may match an empty string or refer to their own groups are matched
+    on their own.
+    """
+
+    def __init__(self, patterns: List[Text], flags: int = 0):
+        self.patterns = patterns
+        self.flags = flags
+
+        # (index of the pattern, compiled pattern)
+        self.single = []
+        combinable = []
+        for index, pattern in enumerate(patterns):
+            compiled = re.compile(pattern, flags)
+            if UNCOMBINABLE_PATTERN_REGEX.search(pattern) or can_match_empty(compiled):
+                self.single.append((index, compiled))
+            else:
+                combinable.append(index)
+
+        # (finder, matcher, indexes of the patterns, group of each pattern)
+        self.combined = []
+        for low in range(0, len(combinable), COMBINED_PATTERNS_MAX):
+            indexes = combinable[low : low + COMBINED_PATTERNS_MAX]
+            finder = re.compile(
+                "|".join(f"(?:{patterns[index]})" for index in indexes), flags
+            )
+            matcher = re.compile(
+                "".join(
+                    f"(?:(?=(?P<pattern{number}>{patterns[index]}))|)"
+                    for number, index in enumerate(indexes)
+                ),
+                flags,
+            )
+            groups = [
+                matcher.groupindex[f"pattern{number}"] for number in range(len(indexes))
+            ]
+            self.combined.append((finder, matcher, indexes, groups))
+
+    def finditer(self, text: Text) -> List[Tuple[int, int, int]]:
+        """(index of the pattern, start, end) of the matches in the text,
+        ordered by pattern and then by start."""
+        spans = [[] for _ in self.patterns]
+
+        for index, compiled in self.single:
+            spans[index] = [match.span() for match in compiled.finditer(text)]
+
+        for finder, matcher, indexes, groups in self.combined:
+            # where each pattern may match again, after the end of its last match
+            next_starts = [0] * len(indexes)
+            position = 0
+            while True:
+                found = finder.search(text, position)
+                if found is None:
+                    break
+                position = found.start()
+
+                regs = matcher.match(text, position).regs
+                for number, group in enumerate(groups):
+                    start, end = regs[group]
+                    if start == position and position >= next_starts[number]:
+                        spans[indexes[number]].append((start, end))
+                        next_starts[number] = end
+
+                position += 1
+
+        return [
+            (index, start, end)
+            for index, pattern_spans in enumerate(spans)
+            for start, end in pattern_spans
+        ]
@@ -1,3 +1,6 @@
+import bisect
+import logging
+import time
 from typing import Any, Optional, Text, Dict, List, Type
 
 from rasa.nlu.components import Component
@@ -6,6 +9,8 @@ from rasa.nlu.training_data import Message, TrainingData
 
 from bothub.shared.utils.preprocessing.preprocessing_factory import PreprocessingFactory
 
+logger = logging.getLogger(__name__)
+
 
 class Preprocessing(Component):
 
@@ -26,6 +31,7 @@ class Preprocessing(Component):
     def __init__(self, component_config: Optional[Dict[Text, Any]] = None) -> None:
         super(Preprocessing, self).__init__(component_config)
         self.language = self.component_config["language"]
+        self.preprocessor = PreprocessingFactory.factory(self.language)
 
     @classmethod
     def create(
@@ -51,29 +57,54 @@ class Preprocessing(Component):
 
     @staticmethod
     def remove_overlapping_entities(entities):
-        new_entities = []
-        for i in range(len(entities)):
-            overlap = False
-            for j in range(len(entities)):
-                if i != j and (
-                    entities[i]["start"] >= entities[j]["start"]
-                    and entities[i]["end"] <= entities[j]["end"]
-                ):
-                    overlap = True
-                elif i != j and (
-                    (
-                        entities[i]["end"] > entities[j]["start"]
-                        and entities[i]["start"] < entities[j]["end"]
-                    )
-                    and not (
-                        entities[j]["start"] >= entities[i]["start"]
-                        and entities[j]["end"] <= entities[i]["end"]
-                    )
-                ):
-                    overlap = True
-            if not overlap:
-                new_entities.append(entities[i])
-        return new_entities
+        """
+        Entities not inside another entity and not partially overlapping
+        another one, in their order. Identical spans remove each other.
+        """
+        count = len(entities)
+        order = sorted(range(count), key=lambda i: entities[i]["start"])
+        starts = [entities[i]["start"] for i in order]
+        ends = [entities[i]["end"] for i in order]
+
+        # ends_max[k][x] is the max of ends[x:x + 2 ** k]
+        ends_max = [ends]
+        width = 1
+        while width * 2 <= count:
+            previous = ends_max[-1]
+            ends_max.append(
+                [
+                    max(previous[x], previous[x + width])
+                    for x in range(count - width * 2 + 1)
+                ]
+            )
+            width *= 2
+
+        def max_end(low, high):
+            k = (high - low).bit_length() - 1
+            return max(ends_max[k][low], ends_max[k][high - (1 << k)])
+
+        kept = set()
+        # max end of the entities starting before the current start
+        before_end = None
+        low = 0
+        while low < count:
+            start = starts[low]
+            high = bisect.bisect_right(starts, start, low)
+            end = max(ends[low:high])
+
+            # only the single longest entity of a start may be kept
+            if ends[low:high].count(end) == 1 and (
+                before_end is None or (before_end <= start and before_end < end)
+            ):
+                # entities starting inside it must end inside it
+                inside = bisect.bisect_left(starts, end, high)
+                if high == inside or max_end(high, inside) <= end:
+                    kept.add(order[low + ends[low:high].index(end)])
+
+            before_end = end if before_end is None else max(before_end, end)
+            low = high
+
+        return [entities[i] for i in range(count) if i in kept]
 
     def train(
         self,
@@ -82,14 +113,13 @@ class Preprocessing(Component):
         **kwargs: Any,
     ) -> None:
         """Train this component"""
-        not_repeated_phrases = set()
+        start = time.perf_counter()
         size = len(training_data.training_examples)
-        subtract_idx = 0
-        language_preprocessor = PreprocessingFactory().factory(self.language)
-
-        for idx in range(size):
-            example = training_data.training_examples[idx - subtract_idx]
 
+        # keeps the first example of each preprocessed phrase, in order
+        not_repeated_phrases = set()
+        training_examples = []
+        for example in training_data.training_examples:
             if "entities" in example.data and self.do_entities_overlap(
                 example.data["entities"]
             ):
@@ -97,18 +127,33 @@ class Preprocessing(Component):
                     example.data["entities"]
                 )
 
-            example_text = language_preprocessor.preprocess(example.text)
+            example_text = self.preprocessor.preprocess(example.text)
 
-            if example_text in not_repeated_phrases:
-                # remove example at this index from training_examples
-                training_data.training_examples.pop(idx - subtract_idx)
-                subtract_idx += 1
-            else:
+            if example_text not in not_repeated_phrases:
                 not_repeated_phrases.add(example_text)
-                training_data.training_examples[idx - subtract_idx].text = example_text
+                example.text = example_text
+                training_examples.append(example)
+
+        training_data.training_examples[:] = training_examples
+
+        logger.info(
+            f"Preprocessed {size} training examples in "
+            f"{time.perf_counter() - start:.3f}s, "
+            f"{size - len(training_examples)} repeated phrases removed"
+        )
+
+    def preprocess(self, text: Text) -> Text:
+        """Text as set to an incoming message by `process`."""
+
+        return self.preprocessor.preprocess(text)
 
     def process(self, message: Message, **kwargs: Any) -> None:
         """Process an incoming message."""
 
-        language_preprocessor = PreprocessingFactory().factory(self.language)
-        message.text = language_preprocessor.preprocess(message.text)
+        message.text = self.preprocess(message.text)
+
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+        """Process a batch of incoming messages."""
+
+        for message in messages:
+            message.text = self.preprocessor.preprocess(message.text)
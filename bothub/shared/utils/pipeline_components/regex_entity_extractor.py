@@ -1,7 +1,7 @@
 import logging
 import os
 import re
-from typing import Any, Dict, List, Optional, Text, Union
+from typing import Any, Dict, List, Optional, Text, Tuple, Union
 
 import rasa.utils.common
 import rasa.utils.io
@@ -20,6 +20,8 @@ from rasa.nlu.constants import (
 )
 from rasa.nlu.extractors.extractor import EntityExtractor
 from ..preprocessing.preprocessing_base import PreprocessingBase
+from .lookup_matcher import LOOKUP_MATCHER_VERSION, LookupMatcher
+from .pattern_matcher import PatternMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +52,41 @@ def read_lookup_table_file(lookup_table_file: Text) -> List[Text]:
     return elements_to_regex
 
 
+def _read_lookup_table(lookup_table: Dict[Text, Union[Text, List[Text]]]) -> List[Text]:
+    """Elements of the lookup table, either a file or a list of entries."""
+    lookup_elements = lookup_table["elements"]
+
+    # if it's a list, it should be the elements directly
+    if isinstance(lookup_elements, list):
+        return lookup_elements
+    # otherwise it's a file path.
+    return read_lookup_table_file(lookup_elements)
+
+
+def _generate_lookup_elements(
+    lookup_table: Dict[Text, Union[Text, List[Text]]]
+) -> Optional[List[Text]]:
+    """Preprocessed elements of the given lookup table, to be matched by a
+    LookupMatcher.
+
+    Args:
+        lookup_table: The lookup table.
+
+    Returns:
+        The elements, or None if the lookup table has regex elements or
+        elements the LookupMatcher does not support.
+    """
+    elements = _read_lookup_table(lookup_table)
+    if any(e.startswith("regex ") for e in elements):
+        return None
+
+    preprocessor = PreprocessingBase()
+    elements = [preprocessor.preprocess(e) for e in elements]
+    if not LookupMatcher.supports(elements):
+        return None
+    return elements
+
+
 def _generate_lookup_regex(lookup_table: Dict[Text, Union[Text, List[Text]]]) -> Text:
     """Creates a regex pattern from the given lookup table.
 
@@ -61,14 +98,7 @@ def _generate_lookup_regex(lookup_table: Dict[Text, Union[Text, List[Text]]]) ->
     Returns:
         The regex pattern.
     """
-    lookup_elements = lookup_table["elements"]
-
-    # if it's a list, it should be the elements directly
-    if isinstance(lookup_elements, list):
-        elements_to_regex = lookup_elements
-    # otherwise it's a file path.
-    else:
-        elements_to_regex = read_lookup_table_file(lookup_elements)
+    elements_to_regex = _read_lookup_table(lookup_table)
 
     # sanitize the regex, escape special characters
     preprocessor = PreprocessingBase()
@@ -85,20 +115,27 @@ def _generate_lookup_regex(lookup_table: Dict[Text, Union[Text, List[Text]]]) ->
 
 def _convert_lookup_tables_to_regex(
     training_data: TrainingData, use_only_entities: bool = False
-) -> List[Dict[Text, Text]]:
-    """Convert the lookup tables from the training data to regex patterns.
+) -> List[Dict[Text, Any]]:
+    """Convert the lookup tables from the training data to lookup elements, or
+    to regex patterns when they have regex elements.
     Args:
         training_data: The training data.
         use_only_entities: If True only regex features with a name equal to a entity
           are considered.
 
     Returns:
-        A list of regex patterns.
+        A list of lookup elements and regex patterns.
     """
     patterns = []
     for table in training_data.lookup_tables:
         if use_only_entities and table["name"] not in training_data.entities:
             continue
+        elements = _generate_lookup_elements(table)
+        if elements is not None:
+            # if file is empty
+            if elements:
+                patterns.append({"name": table["name"], "elements": elements})
+            continue
         regex_pattern = _generate_lookup_regex(table)
         # if file is empty
         if regex_pattern == r"(\b\b)":
@@ -185,11 +222,71 @@ class RegexEntityExtractorCustom(EntityExtractor):
         self,
         component_config: Optional[Dict[Text, Any]] = None,
         patterns: Optional[List[Dict[Text, Text]]] = None,
+        lookup_matchers: Optional[List[Tuple[int, LookupMatcher]]] = None,
     ):
         super(RegexEntityExtractorCustom, self).__init__(component_config)
 
         self.case_sensitive = self.component_config["case_sensitive"]
         self.patterns = patterns or []
+        self._build_matchers(lookup_matchers)
+
+    def _build_matchers(
+        self, lookup_matchers: Optional[List[Tuple[int, LookupMatcher]]] = None
+    ) -> None:
+        """Patterns compiled once, with the case flag. The lookup matchers
+        given, loaded with the model, are used instead of being built again."""
+        flags = 0  # default flag
+        if not self.case_sensitive:
+            flags = re.IGNORECASE
+
+        # indexes of the regex patterns and of the lookup elements in patterns
+        self.regex_indexes = [
+            index for index, pattern in enumerate(self.patterns) if "pattern" in pattern
+        ]
+        self.matcher = PatternMatcher(
+            [self.patterns[index]["pattern"] for index in self.regex_indexes], flags
+        )
+        if lookup_matchers is not None:
+            self.lookup_matchers = lookup_matchers
+            return
+        self.lookup_matchers = [
+            (index, LookupMatcher(pattern["elements"], self.case_sensitive))
+            for index, pattern in enumerate(self.patterns)
+            if "elements" in pattern
+        ]
+
+    @staticmethod
+    def _load_lookup_matchers(
+        lookup_matchers_file: Text,
+        patterns: List[Dict[Text, Any]],
+        case_sensitive: bool,
+    ) -> Optional[List[Tuple[int, LookupMatcher]]]:
+        """Lookup matchers persisted with the model, or None if they do not
+        match the patterns and have to be built again."""
+        try:
+            persisted = rasa.utils.io.pickle_load(lookup_matchers_file)
+        except Exception as e:
+            # e.g. a truncated file or a LookupMatcher moved since it was saved
+            logger.warning(
+                f"Could not load lookup matchers from {lookup_matchers_file}, "
+                f"building them again: {e}"
+            )
+            return None
+        if not isinstance(persisted, dict) or (
+            persisted.get("version") != LOOKUP_MATCHER_VERSION
+        ):
+            return None
+
+        lookup_matchers = persisted["lookup_matchers"]
+        indexes = [
+            index for index, pattern in enumerate(patterns) if "elements" in pattern
+        ]
+        if [index for index, _ in lookup_matchers] != indexes or any(
+            lookup_matcher.case_sensitive != case_sensitive
+            for _, lookup_matcher in lookup_matchers
+        ):
+            return None
+        return lookup_matchers
 
     def train(
         self,
@@ -203,6 +300,7 @@ class RegexEntityExtractorCustom(EntityExtractor):
             use_regexes=self.component_config["use_regexes"],
             use_only_entities=False,
         )
+        self._build_matchers()
 
         if not self.patterns:
             rasa.utils.common.raise_warning(
@@ -226,26 +324,23 @@ class RegexEntityExtractorCustom(EntityExtractor):
     def _extract_entities(self, message: Message) -> List[Dict[Text, Any]]:
         """Extract entities of the given type from the given user message."""
         entities = []
+        text = message.get(TEXT)
 
-        flags = 0  # default flag
-        if not self.case_sensitive:
-            flags = re.IGNORECASE
-
-        for pattern in self.patterns:
-            matches = re.finditer(pattern["pattern"], message.get(TEXT), flags=flags)
-            matches = list(matches)
+        # (start, end) of the matches of each pattern
+        spans = [[] for _ in self.patterns]
+        for number, start_index, end_index in self.matcher.finditer(text):
+            spans[self.regex_indexes[number]].append((start_index, end_index))
+        for index, lookup_matcher in self.lookup_matchers:
+            spans[index] = lookup_matcher.finditer(text)
 
-            for match in matches:
-                start_index = match.start()
-                end_index = match.end()
+        for pattern, pattern_spans in zip(self.patterns, spans):
+            for start_index, end_index in pattern_spans:
                 entities.append(
                     {
                         ENTITY_ATTRIBUTE_TYPE: pattern["name"],
                         ENTITY_ATTRIBUTE_START: start_index,
                         ENTITY_ATTRIBUTE_END: end_index,
-                        ENTITY_ATTRIBUTE_VALUE: message.get(TEXT)[
-                            start_index:end_index
-                        ],
+                        ENTITY_ATTRIBUTE_VALUE: text[start_index:end_index],
                     }
                 )
 
@@ -264,17 +359,42 @@ class RegexEntityExtractorCustom(EntityExtractor):
         file_name = meta.get("file")
         regex_file = os.path.join(model_dir, file_name)
 
-        if os.path.exists(regex_file):
-            patterns = rasa.utils.io.read_json_file(regex_file)
-            return RegexEntityExtractorCustom(meta, patterns=patterns)
+        if not os.path.exists(regex_file):
+            return RegexEntityExtractorCustom(meta)
+
+        patterns = rasa.utils.io.read_json_file(regex_file)
+
+        # models persisted without lookup matchers build them again
+        lookup_matchers = None
+        lookup_matchers_file = meta.get("lookup_matchers_file")
+        if lookup_matchers_file:
+            lookup_matchers_file = os.path.join(model_dir, lookup_matchers_file)
+            if os.path.exists(lookup_matchers_file):
+                lookup_matchers = cls._load_lookup_matchers(
+                    lookup_matchers_file,
+                    patterns,
+                    meta.get("case_sensitive", cls.defaults["case_sensitive"]),
+                )
 
-        return RegexEntityExtractorCustom(meta)
+        return RegexEntityExtractorCustom(
+            meta, patterns=patterns, lookup_matchers=lookup_matchers
+        )
 
     def persist(self, file_name: Text, model_dir: Text) -> Optional[Dict[Text, Any]]:
         """Persist this model into the passed directory.
         Return the metadata necessary to load the model again."""
+        lookup_matchers_file_name = f"{file_name}_lookup_matchers.pkl"
         file_name = f"{file_name}.json"
         regex_file = os.path.join(model_dir, file_name)
         rasa.utils.io.dump_obj_as_json_to_file(regex_file, self.patterns)
 
-        return {"file": file_name}
+        if not self.lookup_matchers:
+            return {"file": file_name}
+
+        # the automatons of the lookup tables, loaded instead of being built again
+        rasa.utils.io.pickle_dump(
+            os.path.join(model_dir, lookup_matchers_file_name),
+            {"version": LOOKUP_MATCHER_VERSION, "lookup_matchers": self.lookup_matchers},
+        )
+
+        return {"file": file_name, "lookup_matchers_file": lookup_matchers_file_name}
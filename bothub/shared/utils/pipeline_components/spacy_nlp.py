@@ -1,5 +1,6 @@
 from bothub_nlp_celery.app import nlp_language
 from rasa.nlu.config import override_defaults
+from rasa.nlu.constants import SPACY_DOCS, TEXT
 from rasa.nlu.utils.spacy_utils import SpacyNLP as RasaNLUSpacyNLP
 
 
@@ -26,3 +27,8 @@ class SpacyNLP(RasaNLUSpacyNLP):
 
         cls.ensure_proper_language_model(nlp_language)
         return cls(component_config, nlp_language)
+
+    def process_batch(self, messages, **kwargs):
+        docs = self.nlp.pipe([self.preprocess_text(message.text) for message in messages])
+        for message, doc in zip(messages, docs):
+            message.set(SPACY_DOCS[TEXT], doc)
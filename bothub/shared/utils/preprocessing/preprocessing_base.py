@@ -5,13 +5,83 @@ import re
 
 logger = logging.getLogger(__name__)
 
+NON_ASCII_REGEX = re.compile(r"[^\x00-\x7f]")
+EMOJI_CODE_REGEX = re.compile(r":[A-Za-z0-9\-_]+:")
+# codes replaced one after the other can differ from replacing all of them at
+# once when two codes share a colon, like ":a:b:", or a replacement may join
+# its neighbours into a new code, like ":" + ":a:" + ":"
+OVERLAPPING_EMOJI_CODES_REGEX = re.compile(
+    r":[A-Za-z0-9\-_]+:[A-Za-z0-9\-_]+:"
+    r"|[A-Za-z0-9\-_:]:[A-Za-z0-9\-_]+:[A-Za-z0-9\-_:]"
+)
+
+
+class ContractionRules(object):
+    """
+    Rewrite rules applied to a phrase in a single scan.
+    The (pattern, replacement) rules are compiled into one alternation, at each
+    position the first matching rule wins. The result is the same as running
+    re.sub for each rule in order, as long as no replacement is matched by a
+    later rule.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+
+        # consecutive rules starting at a word boundary share a single \b,
+        # so the regex is only tried at word starts
+        alternatives = []
+        for index, (pattern, _) in enumerate(rules):
+            bounded = pattern.startswith(r"\b")
+            group = f"(?P<rule{index}>{pattern[2:] if bounded else pattern})"
+            if bounded and alternatives and alternatives[-1][0]:
+                alternatives[-1][1].append(group)
+            else:
+                alternatives.append((bounded, [group]))
+
+        self.regex = re.compile(
+            "|".join(
+                r"\b(?:" + "|".join(groups) + ")" if bounded else groups[0]
+                for bounded, groups in alternatives
+            )
+        )
+        self.replacements = {
+            f"rule{index}": replacement
+            for index, (_, replacement) in enumerate(rules)
+        }
+
+    def _replace(self, match):
+        # the named group of the rule is the outermost, so it is closed last
+        return self.replacements[match.lastgroup]
+
+    def sub(self, phrase: str):
+        return self.regex.sub(self._replace, phrase)
+
 
 class PreprocessingBase(object):
+    language = None
     emoji_contractions = {}
+    # ContractionRules applied after the default preprocessing
+    contractions = None
+
+    def __init__(self, cache=None):
+        # PreprocessingCache of the preprocessed phrases, None disables it
+        self.cache = cache
 
     def preprocess(self, phrase: str = None):
+        if self.cache is not None and phrase is not None:
+            preprocessed = self.cache.get(phrase)
+            if preprocessed is None:
+                preprocessed = self._preprocess(phrase)
+                self.cache.put(phrase, preprocessed)
+            return preprocessed
+        return self._preprocess(phrase)
+
+    def _preprocess(self, phrase: str = None):
         phrase = self.emoji_handling(phrase)
         phrase = self.default_preprocessing(phrase)
+        if self.contractions is not None:
+            phrase = self.contractions.sub(phrase)
         return phrase
 
     @staticmethod
@@ -42,16 +112,29 @@ class PreprocessingBase(object):
         text = ' '.join(code.split('_'))
         return text
 
+    def emoji_replacement(self, code):
+        try:
+            return self.emoji_contractions[code]
+        except KeyError:
+            return self.extract_emoji_text(code)
+
+    def _replace_emoji_code(self, match):
+        return self.emoji_replacement(match.group())
+
     def emoji_handling(self, phrase: str = None):
-        # turn emojis into text codes
-        phrase = emoji.demojize(phrase)
-
-        regex_emoji = r":[A-Za-z0-9\-_]+:"
-        emoji_codes = re.findall(regex_emoji, phrase)
-        for code in emoji_codes:
-            try:
-                phrase = re.sub(code, self.emoji_contractions[code], phrase)
-            except KeyError:
-                phrase = re.sub(code, self.extract_emoji_text(code), phrase)
+        # emojis are not ASCII, there is nothing to demojize in ASCII phrases
+        if NON_ASCII_REGEX.search(phrase) is not None:
+            # turn emojis into text codes
+            phrase = emoji.demojize(phrase)
+
+        if ":" not in phrase:
+            return phrase
+
+        if OVERLAPPING_EMOJI_CODES_REGEX.search(phrase) is None:
+            return EMOJI_CODE_REGEX.sub(self._replace_emoji_code, phrase)
+
+        # replace each code everywhere in the order they were found
+        for code in EMOJI_CODE_REGEX.findall(phrase):
+            phrase = phrase.replace(code, self.emoji_replacement(code))
 
         return phrase
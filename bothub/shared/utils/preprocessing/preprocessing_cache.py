@@ -0,0 +1,56 @@
+import threading
+from collections import OrderedDict
+
+
+class PreprocessingCache(object):
+    """
+    LRU cache of the preprocessed phrases of a language.
+    Hits and misses are counted, and sent as `preprocessing_cache_hits_total`
+    and `preprocessing_cache_misses_total` to `metrics` when given.
+    """
+
+    def __init__(self, max_size: int, language: str = None, metrics=None):
+        self.max_size = max_size
+        self.language = language or "default"
+        self.metrics = metrics
+
+        self.hits = 0
+        self.misses = 0
+
+        self._phrases = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _count(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if self.metrics is not None:
+            self.metrics.increment(
+                "preprocessing_cache_hits_total"
+                if hit
+                else "preprocessing_cache_misses_total",
+                language=self.language,
+            )
+
+    def get(self, phrase: str):
+        with self._lock:
+            preprocessed = self._phrases.get(phrase)
+            if preprocessed is not None:
+                self._phrases.move_to_end(phrase)
+            self._count(hit=preprocessed is not None)
+        return preprocessed
+
+    def put(self, phrase: str, preprocessed: str):
+        with self._lock:
+            self._phrases[phrase] = preprocessed
+            self._phrases.move_to_end(phrase)
+            while len(self._phrases) > self.max_size:
+                self._phrases.popitem(last=False)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self):
+        return len(self._phrases)
@@ -1,10 +1,25 @@
 import logging
+import threading
 from bothub.shared.utils.preprocessing.preprocessing_english import PreprocessingEnglish
 from bothub.shared.utils.preprocessing.preprocessing_portuguese import PreprocessingPortuguese
 from bothub.shared.utils.preprocessing.preprocessing_base import PreprocessingBase
+from bothub.shared.utils.preprocessing.preprocessing_cache import PreprocessingCache
 
 logger = logging.getLogger(__name__)
 
+# preprocessing class -> instance shared by the whole process
+_preprocessors = {}
+_preprocessors_lock = threading.Lock()
+# (max_size, metrics) of the cache of each shared instance, None disables it
+_cache_config = None
+
+
+def _cache_for(preprocessing_class):
+    if _cache_config is None:
+        return None
+    max_size, metrics = _cache_config
+    return PreprocessingCache(max_size, preprocessing_class.language, metrics)
+
 
 class PreprocessingFactory(object):
 
@@ -13,17 +28,43 @@ class PreprocessingFactory(object):
         """
         Implements Factory Method
         :param language: Language
-        :return: Preprocessing Class respective to its language
+        :return: Preprocessing instance respective to its language, shared by
+            the whole process
         """
         try:
             if language == "en":
-                return PreprocessingEnglish()
+                preprocessing_class = PreprocessingEnglish
             elif language == "pt_br":
-                return PreprocessingPortuguese()
+                preprocessing_class = PreprocessingPortuguese
             else:
-                return PreprocessingBase()
+                preprocessing_class = PreprocessingBase
+
+            preprocessor = _preprocessors.get(preprocessing_class)
+            if preprocessor is None:
+                with _preprocessors_lock:
+                    preprocessor = _preprocessors.get(preprocessing_class)
+                    if preprocessor is None:
+                        preprocessor = preprocessing_class(
+                            _cache_for(preprocessing_class)
+                        )
+                        _preprocessors[preprocessing_class] = preprocessor
+            return preprocessor
 
         except AssertionError as e:
             logger.exception(e)
 
         return None
+
+    @staticmethod
+    def enable_cache(max_size: int, metrics=None):
+        """
+        Keeps the last `max_size` preprocessed phrases of each language
+        :param max_size: Phrases kept per language, 0 disables the cache
+        :param metrics: Metrics counting the cache hits and misses
+        """
+        global _cache_config
+
+        with _preprocessors_lock:
+            _cache_config = (max_size, metrics) if max_size else None
+            for preprocessing_class, preprocessor in _preprocessors.items():
+                preprocessor.cache = _cache_for(preprocessing_class)
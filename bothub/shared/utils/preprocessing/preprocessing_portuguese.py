@@ -1,8 +1,11 @@
-import re
-from bothub.shared.utils.preprocessing.preprocessing_base import PreprocessingBase
+from bothub.shared.utils.preprocessing.preprocessing_base import (
+    ContractionRules,
+    PreprocessingBase,
+)
 
 
 class PreprocessingPortuguese(PreprocessingBase):
+    language = "pt_br"
     emoji_contractions = {
         ":face_with_tears_of_joy:": "hahaha",  # 😂
         ":red_heart_selector:": "amor",  # ❤️
@@ -160,26 +163,19 @@ class PreprocessingPortuguese(PreprocessingBase):
         ":anger_symbol:": "batida",  # 💢
     }
 
-    def preprocess(self, phrase: str = None):
-        phrase = self.emoji_handling(phrase)
-        phrase = self.default_preprocessing(phrase)
-
-        contractions = {
-            "oi": r"\b((o+)(i+)(e*))\b",
-            "sim": r"\b(s|S)+\b",
-            "nao": r"\b(n|N)+\b",
-            "beleza": r"\b(blz)z*a*\b",
-            "estou": r"\b(t)o+\b",
-            "esta": r"\b(t)a+\b",
-            "marketing": r"\b(mkt)\b",
-            "okay": r"\b(ok(a|e)*(y*))\b",
-            "bom dia": r"\b(bd)\b",
-            "falou": r"\b(f(a*)l(o*)(w|u)+(s*))\b",
-            "valeu": r"\b(v(a*)l(e*)(w|u)+(s*))\b",
-            "tranquilo": r"\b(tranks)\b",
-        }
-
-        for word in contractions.keys():
-            phrase = re.sub(contractions[word], word, phrase)
-
-        return phrase
+    contractions = ContractionRules(
+        [
+            (r"\b((o+)(i+)(e*))\b", "oi"),
+            (r"\b(s|S)+\b", "sim"),
+            (r"\b(n|N)+\b", "nao"),
+            (r"\b(blz)z*a*\b", "beleza"),
+            (r"\b(t)o+\b", "estou"),
+            (r"\b(t)a+\b", "esta"),
+            (r"\b(mkt)\b", "marketing"),
+            (r"\b(ok(a|e)*(y*))\b", "okay"),
+            (r"\b(bd)\b", "bom dia"),
+            (r"\b(f(a*)l(o*)(w|u)+(s*))\b", "falou"),
+            (r"\b(v(a*)l(e*)(w|u)+(s*))\b", "valeu"),
+            (r"\b(tranks)\b", "tranquilo"),
+        ]
+    )
@@ -1,9 +1,31 @@
 import datetime
+import sys
+from time import perf_counter
 from rasa.nlu.model import Metadata, Interpreter
 from rasa.nlu.components import Component, ComponentBuilder
 from rasa.nlu import components
+from rasa.nlu.classifiers.classifier import IntentClassifier
+from rasa.nlu.constants import ENTITIES, INTENT
+from rasa.nlu.extractors.extractor import EntityExtractor
 from rasa.nlu.training_data import Message
-from typing import Any, Dict, List, Text, Optional
+from typing import Any, Dict, Iterable, List, Text, Optional, Tuple
+
+from bothub.shared.utils.pipeline_components.preprocessing import Preprocessing
+
+PARSE_OUTPUTS = [INTENT, ENTITIES]
+
+
+def normalize_outputs(outputs: Optional[Iterable[Text]]) -> Optional[Tuple[Text]]:
+    """Sorted tuple of the requested parse outputs, None for all of them."""
+    if outputs is None:
+        return None
+    outputs = tuple(sorted(set(outputs)))
+    for output in outputs:
+        if output not in PARSE_OUTPUTS:
+            raise ValueError(
+                f"'{output}' is not a valid parse output. Choose from {PARSE_OUTPUTS}"
+            )
+    return outputs
 
 
 class BothubInterpreter(Interpreter):
@@ -99,27 +121,159 @@ class BothubInterpreter(Interpreter):
         text: Text,
         time: Optional[datetime.datetime] = None,
         only_output_properties: bool = True,
+        profile: Optional[List[Dict[Text, Any]]] = None,
+        outputs: Optional[Iterable[Text]] = None,
+        preprocessed_text: Optional[Text] = None,
     ) -> Dict[Text, Any]:
         """Parse the input text, classify it and return pipeline result.
-        The pipeline result usually contains intent and entities."""
+        The pipeline result usually contains intent and entities.
+
+        If a `profile` list is given, the wall time and the number of memory
+        blocks allocated by each component are appended to it.
+
+        `outputs` lists the results needed, "intent" and/or "entities".
+        Components only producing results not listed are skipped.
+
+        `preprocessed_text`, the text as returned by `preprocess`, skips the
+        preprocessing components of the pipeline.
+        """
 
         if not text.replace(" ", ""):
             # Not all components are able to handle empty strings. So we need
             # to prevent that... This default return will not contain all
             # output attributes of all components, but in the end, no one
             # should pass an empty string in the first place.
+            return self._empty_output()
+
+        message = Message(
+            text if preprocessed_text is None else preprocessed_text,
+            self.default_output_attributes(),
+            time=time,
+        )
+        pipeline, context = self._pipeline_for(
+            outputs, preprocessed=preprocessed_text is not None
+        )
+
+        for component in pipeline:
+            if profile is None:
+                component.process(message, **context)
+                continue
+
+            allocated_blocks = sys.getallocatedblocks()
+            start = perf_counter()
+            component.process(message, **context)
+            profile.append(
+                {
+                    "component": type(component).__name__,
+                    "seconds": perf_counter() - start,
+                    # net count of the process, other threads are included
+                    "allocated_blocks": sys.getallocatedblocks() - allocated_blocks,
+                }
+            )
+
+        output = self.default_output_attributes()
+        output.update(message.as_dict(only_output_properties=only_output_properties))
+
+        return output
+
+    def parse_batch(
+        self,
+        texts: List[Text],
+        time: Optional[datetime.datetime] = None,
+        only_output_properties: bool = True,
+        outputs: Optional[Iterable[Text]] = None,
+        preprocessed_texts: Optional[List[Text]] = None,
+    ) -> List[Dict[Text, Any]]:
+        """Parse a list of texts, returning their results in the same order.
+
+        Components implementing `process_batch` process all messages in a
+        single call, e.g. one forward pass of the language model and of the
+        classifier. The others process the messages one by one.
+        `preprocessed_texts` are handled as `preprocessed_text` by `parse`.
+        """
+
+        results = [None] * len(texts)
+        messages = []
+        indexes = []
+        for index, text in enumerate(texts):
+            if not text.replace(" ", ""):
+                results[index] = self._empty_output()
+            else:
+                if preprocessed_texts is not None:
+                    text = preprocessed_texts[index]
+                messages.append(
+                    Message(text, self.default_output_attributes(), time=time)
+                )
+                indexes.append(index)
+
+        if messages:
+            pipeline, context = self._pipeline_for(
+                outputs, preprocessed=preprocessed_texts is not None
+            )
+            for component in pipeline:
+                process_batch = getattr(component, "process_batch", None)
+                if process_batch is not None:
+                    process_batch(messages, **context)
+                else:
+                    for message in messages:
+                        component.process(message, **context)
+
+        for index, message in zip(indexes, messages):
             output = self.default_output_attributes()
-            output['intent_ranking'] = []
-            output["text"] = ""
+            output.update(
+                message.as_dict(only_output_properties=only_output_properties)
+            )
+            results[index] = output
+
+        return results
+
+    def _pipeline_for(
+        self, outputs: Optional[Iterable[Text]], preprocessed: bool = False
+    ) -> Tuple[List[Component], Dict[Text, Any]]:
+        """Components and context needed to produce `outputs`, without the
+        preprocessing components if the text is already `preprocessed`.
+
+        Components producing intents and entities at once, like DIET, get the
+        requested outputs as the `parse_outputs` context value.
+        """
+        pipeline = self.pipeline
+        if preprocessed:
+            start = 0
+            while start < len(pipeline) and isinstance(pipeline[start], Preprocessing):
+                start += 1
+            pipeline = pipeline[start:]
 
-            return output
+        outputs = normalize_outputs(outputs)
+        if outputs is None:
+            return pipeline, self.context
 
-        message = Message(text, self.default_output_attributes(), time=time)
+        selected = []
+        for component in pipeline:
+            is_classifier = isinstance(component, IntentClassifier)
+            is_extractor = isinstance(component, EntityExtractor)
+            if is_classifier and not is_extractor and INTENT not in outputs:
+                continue
+            if is_extractor and not is_classifier and ENTITIES not in outputs:
+                continue
+            selected.append(component)
 
+        return selected, dict(self.context, parse_outputs=outputs)
+
+    def preprocess(self, text: Text) -> Text:
+        """Text after the preprocessing components at the start of the pipeline.
+
+        The rest of the pipeline only sees this text, so texts with the same
+        preprocessed text have the same parse result.
+        """
         for component in self.pipeline:
-            component.process(message, **self.context)
+            if not isinstance(component, Preprocessing):
+                break
+            text = component.preprocess(text)
+        return text
 
+    def _empty_output(self) -> Dict[Text, Any]:
         output = self.default_output_attributes()
-        output.update(message.as_dict(only_output_properties=only_output_properties))
+        output["intent_ranking"] = []
+        output["text"] = ""
 
         return output
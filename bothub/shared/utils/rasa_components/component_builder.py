@@ -0,0 +1,53 @@
+import threading
+
+from rasa.nlu import registry
+from rasa.nlu.components import ComponentBuilder
+from rasa.nlu.model import Metadata
+
+
+class SharedComponentBuilder(ComponentBuilder):
+    """ComponentBuilder shared by every interpreter of the process.
+
+    Components defining a `cache_key`, like the spaCy and transformers
+    language models, are created once per key and reused by every pipeline
+    of the same language. Components without a key are built per pipeline.
+    """
+
+    def __init__(self):
+        super().__init__(use_cache=True)
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, component_meta, model_metadata):
+        component_name = component_meta.get("class", component_meta["name"])
+        component_class = registry.get_component_class(component_name)
+        cache_key = component_class.cache_key(component_meta, model_metadata)
+        if cache_key is None:
+            return None
+
+        # concurrent loads of the same language model wait for the first one
+        with self._lock:
+            return self._key_locks.setdefault(cache_key, threading.Lock())
+
+    def load_component(self, component_meta, model_dir, model_metadata, **context):
+        lock = self._key_lock(component_meta, model_metadata)
+        if lock is None:
+            return super().load_component(
+                component_meta, model_dir, model_metadata, **context
+            )
+
+        with lock:
+            return super().load_component(
+                component_meta, model_dir, model_metadata, **context
+            )
+
+    def create_component(self, component_config, cfg):
+        lock = self._key_lock(component_config, Metadata(cfg.as_dict(), None))
+        if lock is None:
+            return super().create_component(component_config, cfg)
+
+        with lock:
+            return super().create_component(component_config, cfg)
+
+
+shared_component_builder = SharedComponentBuilder()
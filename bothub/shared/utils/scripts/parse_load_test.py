@@ -0,0 +1,99 @@
+"""
+Script comparing parse latency through Celery and through the HTTP parse server
+of a running worker (BOTHUB_NLP_HTTP_PORT)
+Usage example:
+!python parse_load_test.py 49 <repository_authorization> --url http://localhost:8001 --queue en
+"""
+
+# !/usr/bin/env python
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(
+    1, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+)
+
+
+def parse_with_celery(queue):
+    from bothub_nlp_celery.app import celery_app
+    from bothub_nlp_celery.tasks import TASK_NLU_PARSE_TEXT
+
+    def parse(repository_version, repository_authorization, text):
+        return celery_app.send_task(
+            TASK_NLU_PARSE_TEXT,
+            args=[repository_version, repository_authorization, text],
+            queue=queue,
+        ).get()
+
+    return parse
+
+
+def parse_with_http(url):
+    session = requests.Session()
+
+    def parse(repository_version, repository_authorization, text):
+        response = session.post(
+            f"{url}/parse",
+            json={
+                "repository_version": repository_version,
+                "repository_authorization": repository_authorization,
+                "text": text,
+            },
+        )
+        response.raise_for_status()
+        return response.json()
+
+    return parse
+
+
+def run(parse, arguments):
+    def timed_parse(index):
+        start = time.monotonic()
+        # distinct texts, so the result cache does not hide the parse
+        parse(
+            arguments.repository_version,
+            arguments.repository_authorization,
+            f"{arguments.text} {index}",
+        )
+        return time.monotonic() - start
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=arguments.concurrency) as executor:
+        latencies = sorted(executor.map(timed_parse, range(arguments.requests)))
+    elapsed = time.monotonic() - start
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return (
+        f"{arguments.requests / elapsed:.1f} parses/s, "
+        f"p50 {percentile(0.5):.1f}ms, "
+        f"p90 {percentile(0.9):.1f}ms, "
+        f"p99 {percentile(0.99):.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    PARSER = argparse.ArgumentParser()
+    PARSER.add_argument("repository_version", type=int)
+    PARSER.add_argument("repository_authorization", type=str)
+    PARSER.add_argument("--text", type=str, default="quero comprar um carro")
+    PARSER.add_argument("--requests", type=int, default=200)
+    PARSER.add_argument("--concurrency", type=int, default=5)
+    PARSER.add_argument(
+        "--url", type=str, default=None, help="URL of the worker HTTP parse server."
+    )
+    PARSER.add_argument(
+        "--queue", type=str, default=None, help="Celery queue of the worker."
+    )
+    ARGUMENTS = PARSER.parse_args()
+
+    if ARGUMENTS.queue:
+        print(f"celery: {run(parse_with_celery(ARGUMENTS.queue), ARGUMENTS)}")
+    if ARGUMENTS.url:
+        print(f"http:   {run(parse_with_http(ARGUMENTS.url), ARGUMENTS)}")
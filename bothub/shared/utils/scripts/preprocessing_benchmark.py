@@ -0,0 +1,135 @@
+"""
+Micro-benchmark of the preprocessing of each language and of the removal of
+overlapping entities in training examples
+Usage example:
+!python preprocessing_benchmark.py --repeat 20000 --entities 500
+"""
+
+# !/usr/bin/env python
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(
+    1, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+)
+
+from bothub.shared.utils.preprocessing.preprocessing_factory import (  # NOQA: E402
+    PreprocessingFactory,
+)
+
+PHRASES = {
+    "en": [
+        "I would like to buy a new car tomorrow morning, please",
+        "ok thx, I’m going to the mkt dept but they’re late and I don’t know why",
+    ],
+    "pt_br": [
+        "quero comprar um carro novo amanhã de manhã, por favor",
+        "oii blz? to indo no mkt, ta bom, flw vlw tranks ok bd sim n",
+    ],
+}
+
+
+def sequential_contractions(rules, phrase):
+    """The contraction rules applied one re.sub at a time."""
+    for pattern, replacement in rules:
+        phrase = re.sub(pattern, replacement, phrase)
+    return phrase
+
+
+def benchmark(language, text, repeat):
+    preprocessor = PreprocessingFactory.factory(language)
+    phrase = preprocessor.default_preprocessing(text)
+    rules = preprocessor.contractions.rules
+
+    sequential = timeit.timeit(
+        lambda: sequential_contractions(rules, phrase), number=repeat
+    )
+    single_pass = timeit.timeit(
+        lambda: preprocessor.contractions.sub(phrase), number=repeat
+    )
+    preprocess = timeit.timeit(
+        lambda: preprocessor.preprocess(text), number=repeat
+    )
+
+    return (
+        f"{language} {text!r}\n"
+        f"  contractions sequential {sequential / repeat * 1e6:.1f}us, "
+        f"single pass {single_pass / repeat * 1e6:.1f}us "
+        f"({sequential / single_pass:.1f}x), "
+        f"preprocess {preprocess / repeat * 1e6:.1f}us"
+    )
+
+
+def quadratic_remove_overlapping_entities(entities):
+    """Removal of overlapping entities comparing every entity with every other."""
+    new_entities = []
+    for i in range(len(entities)):
+        overlap = False
+        for j in range(len(entities)):
+            if i != j and (
+                entities[i]["start"] >= entities[j]["start"]
+                and entities[i]["end"] <= entities[j]["end"]
+            ):
+                overlap = True
+            elif i != j and (
+                (
+                    entities[i]["end"] > entities[j]["start"]
+                    and entities[i]["start"] < entities[j]["end"]
+                )
+                and not (
+                    entities[j]["start"] >= entities[i]["start"]
+                    and entities[j]["end"] <= entities[i]["end"]
+                )
+            ):
+                overlap = True
+        if not overlap:
+            new_entities.append(entities[i])
+    return new_entities
+
+
+def benchmark_overlapping_entities(count, repeat):
+    from bothub.shared.utils.pipeline_components.preprocessing import Preprocessing
+
+    # dense machine generated annotations, many nested and crossing entities
+    rng = random.Random(0)
+    entities = []
+    for _ in range(count):
+        start = rng.randint(0, count * 4)
+        entities.append(
+            {"start": start, "end": start + rng.randint(1, 12), "entity": "entity"}
+        )
+
+    repeat = max(1, repeat // count)
+    quadratic = timeit.timeit(
+        lambda: quadratic_remove_overlapping_entities(entities), number=repeat
+    )
+    sweep = timeit.timeit(
+        lambda: Preprocessing.remove_overlapping_entities(entities), number=repeat
+    )
+
+    return (
+        f"{count} entities: overlapping removal quadratic "
+        f"{quadratic / repeat * 1000:.2f}ms, sweep {sweep / repeat * 1000:.2f}ms "
+        f"({quadratic / sweep:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    PARSER = argparse.ArgumentParser()
+    PARSER.add_argument("--repeat", type=int, default=20000)
+    PARSER.add_argument(
+        "--entities",
+        type=int,
+        default=500,
+        help="Entities of the example whose overlapping entities are removed.",
+    )
+    ARGUMENTS = PARSER.parse_args()
+
+    for LANGUAGE, TEXTS in PHRASES.items():
+        for TEXT in TEXTS:
+            print(benchmark(LANGUAGE, TEXT, ARGUMENTS.repeat))
+    print(benchmark_overlapping_entities(ARGUMENTS.entities, ARGUMENTS.repeat))
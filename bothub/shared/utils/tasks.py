@@ -0,0 +1,4 @@
+# Names of the tasks of this worker that bothub-nlp-celery does not define
+# yet, to be imported from bothub_nlp_celery.tasks once it does
+
+TASK_NLU_PARSE_TEXT_BATCH = "parse_text_batch"
@@ -0,0 +1,80 @@
+import logging
+import os
+import re
+import shutil
+import tempfile
+
+from bothub.shared.utils.helpers import get_directory_size
+
+logger = logging.getLogger(__name__)
+
+# temporary directories are named <prefix><pid>-<random> so directories
+# left by a finished process can be told apart from the running ones
+TEMPORARY_DIRECTORY_PREFIX = "bothub-nlp-"
+TEMPORARY_DIRECTORY_REGEX = re.compile(
+    rf"^{re.escape(TEMPORARY_DIRECTORY_PREFIX)}(\d+)-"
+)
+
+
+def is_process_running(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # the process exists but belongs to another user
+        return True
+    return True
+
+
+def temporary_directory_prefix():
+    return f"{TEMPORARY_DIRECTORY_PREFIX}{os.getpid()}-"
+
+
+def make_temporary_directory():
+    return tempfile.mkdtemp(prefix=temporary_directory_prefix())
+
+
+def remove_directory(path):
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _temporary_directories(directory=None):
+    """(path, pid of the owner) of the temporary directories in `directory`.
+
+    Only names made by `temporary_directory_prefix` are listed, other
+    directories sharing the prefix, like a model store, are left alone.
+    """
+    directory = directory or tempfile.gettempdir()
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        match = TEMPORARY_DIRECTORY_REGEX.match(name)
+        if match and os.path.isdir(path):
+            yield path, int(match.group(1))
+
+
+def sweep_orphaned_directories(directory=None):
+    """Removes temporary directories of processes that are not running anymore.
+
+    Returns the number of bytes freed.
+    """
+    freed = 0
+    for path, pid in _temporary_directories(directory):
+        if is_process_running(pid):
+            continue
+        freed += get_directory_size(path)
+        remove_directory(path)
+        logger.info(f"Removed orphaned temporary directory {path}")
+    return freed
+
+
+def temporary_directories_usage(directory=None):
+    """Bytes used by the temporary directories of this process."""
+    return sum(
+        get_directory_size(path)
+        for path, pid in _temporary_directories(directory)
+        if pid == os.getpid()
+    )
@@ -1,3 +1,7 @@
+import logging
+
+from celery.signals import worker_init, worker_shutdown
+from celery.worker.control import control_command
 from bothub_nlp_celery.app import celery_app
 
 from bothub_nlp_celery.tasks import (
@@ -11,9 +15,18 @@ from bothub_nlp_celery.tasks import (
     TASK_NLU_WORD_SUGGESTION_TEXT,
 )
 
+try:
+    from bothub_nlp_celery.tasks import TASK_NLU_PARSE_TEXT_BATCH
+except ImportError:  # bothub-nlp-celery releases without the batch task
+    from bothub.shared.utils.tasks import TASK_NLU_PARSE_TEXT_BATCH
+
 from bothub.shared.utils.backend import backend
+from bothub.shared.utils.preprocessing.preprocessing_factory import (
+    PreprocessingFactory,
+)
+from bothub.shared.utils.temporary_directories import sweep_orphaned_directories
 
-from bothub.nlu_worker.task.parse import parse_text
+from bothub.nlu_worker.task.parse import parse_text, parse_text_batch
 from bothub.nlu_worker.task.debug_parse import debug_parse_text
 from bothub.nlu_worker.task.sentence_suggestion import sentence_suggestion_text
 from bothub.nlu_worker.task.word_suggestion import word_suggestion_text
@@ -26,22 +39,154 @@ from bothub.nlu_worker.task.evaluate import evaluate_update
 from bothub.shared.evaluate_crossval import evaluate_crossval_update
 from bothub.shared.train import train_update
 
+from bothub.nlu_worker import settings
+from bothub.nlu_worker.http_server import ParseServer
 from bothub.nlu_worker.interpreter_manager import InterpreterManager
+from bothub.nlu_worker.micro_batcher import MicroBatcher
+from bothub.nlu_worker.parse_cache import ParseResultCache
+from bothub.nlu_worker.parse_coalescer import ParseCoalescer
+from bothub.nlu_worker.profiler import PipelineProfiler
+from bothub.nlu_worker.warmup import (
+    load_snapshot,
+    parse_warmup_repositories,
+    save_snapshot,
+    warm_up,
+)
+
+logger = logging.getLogger(__name__)
 
 interpreter_manager = InterpreterManager()
+micro_batcher = MicroBatcher.from_settings()
+parse_result_cache = ParseResultCache.from_settings(interpreter_manager.metrics)
+parse_coalescer = ParseCoalescer.from_settings(interpreter_manager.metrics)
+pipeline_profiler = PipelineProfiler.from_settings(interpreter_manager.metrics)
+PreprocessingFactory.enable_cache(
+    settings.BOTHUB_NLP_PREPROCESSING_CACHE_SIZE, interpreter_manager.metrics
+)
 
 
-@celery_app.task(name=TASK_NLU_PARSE_TEXT)
-def celery_parse_text(repository_version, repository_authorization, *args, **kwargs):
+def worker_parse_text(repository_version, repository_authorization, *args, **kwargs):
     return parse_text(
         repository_version,
         repository_authorization,
         interpreter_manager,
         *args,
+        micro_batcher=micro_batcher,
+        result_cache=parse_result_cache,
+        coalescer=parse_coalescer,
+        profiler=pipeline_profiler,
         **kwargs
     )
 
 
+def worker_parse_text_batch(
+    repository_version, repository_authorization, *args, **kwargs
+):
+    return parse_text_batch(
+        repository_version,
+        repository_authorization,
+        interpreter_manager,
+        *args,
+        **kwargs
+    )
+
+
+def worker_metrics_text():
+    interpreter_manager.report_usage()
+    return interpreter_manager.metrics.prometheus_text()
+
+
+parse_server = (
+    ParseServer(
+        worker_parse_text,
+        worker_parse_text_batch,
+        worker_metrics_text,
+        workers=settings.BOTHUB_NLP_HTTP_WORKERS,
+        max_pending=settings.BOTHUB_NLP_HTTP_MAX_PENDING,
+    )
+    if settings.BOTHUB_NLP_HTTP_PORT
+    else None
+)
+
+
+@worker_init.connect
+def remove_orphaned_directories(**kwargs):
+    freed = sweep_orphaned_directories()
+    logger.info(f"Removed {freed} bytes of orphaned model directories")
+
+
+@worker_init.connect
+def warm_up_interpreters(**kwargs):
+    # worker_init is sent before the worker starts consuming its queues
+    repositories = parse_warmup_repositories(settings.BOTHUB_NLP_WARMUP_REPOSITORIES)
+    if settings.BOTHUB_NLP_WARMUP_SNAPSHOT:
+        repositories += load_snapshot(settings.BOTHUB_NLP_WARMUP_SNAPSHOT)
+    warm_up(interpreter_manager, repositories, settings.BOTHUB_NLP_WARMUP_TIMEOUT)
+
+
+@worker_init.connect
+def start_parse_server(**kwargs):
+    if parse_server is not None:
+        parse_server.start(settings.BOTHUB_NLP_HTTP_HOST, settings.BOTHUB_NLP_HTTP_PORT)
+
+
+@worker_shutdown.connect
+def stop_parse_server(**kwargs):
+    if parse_server is not None:
+        parse_server.stop()
+
+
+@worker_shutdown.connect
+def save_warmup_snapshot(**kwargs):
+    if settings.BOTHUB_NLP_WARMUP_SNAPSHOT:
+        try:
+            save_snapshot(
+                settings.BOTHUB_NLP_WARMUP_SNAPSHOT,
+                interpreter_manager,
+                settings.BOTHUB_NLP_WARMUP_SNAPSHOT_SIZE,
+            )
+        except OSError as e:
+            logger.warning(f"Could not save warm-up snapshot: {e}")
+
+
+@control_command(
+    args=[("repository_version", int)], signature="<repository_version>"
+)
+def invalidate_interpreter(state, repository_version):
+    interpreter_manager.invalidate(repository_version)
+    return {"ok": f"interpreter of {repository_version} invalidated"}
+
+
+@control_command()
+def interpreter_metrics(state):
+    """Interpreter cache and load metrics in Prometheus text format."""
+    return {"ok": worker_metrics_text()}
+
+
+@control_command()
+def pipeline_profile(state):
+    """Time and allocations of each pipeline component, per repository version."""
+    if pipeline_profiler is None:
+        return {"error": "profiling is disabled"}
+    return {"ok": pipeline_profiler.stats()}
+
+
+@celery_app.task(name=TASK_NLU_PARSE_TEXT)
+def celery_parse_text(repository_version, repository_authorization, *args, **kwargs):
+    return worker_parse_text(
+        repository_version, repository_authorization, *args, **kwargs
+    )
+
+
+@celery_app.task(name=TASK_NLU_PARSE_TEXT_BATCH)
+def celery_parse_text_batch(
+    repository_version, repository_authorization, *args, **kwargs
+):
+    return worker_parse_text_batch(
+        repository_version, repository_authorization, *args, **kwargs
+    )
+
+
 @celery_app.task(name=TASK_NLU_DEBUG_PARSE_TEXT)
 def celery_debug_parse_text(
     repository_version, repository_authorization, *args, **kwargs
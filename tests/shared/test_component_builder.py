@@ -0,0 +1,70 @@
+import unittest
+import os
+import threading
+import time
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from rasa.nlu.components import Component
+from rasa.nlu.model import Metadata
+
+from bothub.shared.utils.rasa_components.component_builder import (
+    SharedComponentBuilder,
+)
+
+
+class SharedLanguageModel(Component):
+    loads = 0
+
+    @classmethod
+    def cache_key(cls, component_meta, model_metadata):
+        return f"{cls.name}-{component_meta.get('model')}"
+
+    @classmethod
+    def load(cls, meta, model_dir=None, model_metadata=None, cached_component=None, **kwargs):
+        if cached_component:
+            return cached_component
+        SharedLanguageModel.loads += 1
+        time.sleep(0.05)
+        return cls(meta)
+
+
+class PerRepositoryComponent(Component):
+    pass
+
+
+class TestSharedComponentBuilder(unittest.TestCase):
+    def setUp(self, *args):
+        SharedLanguageModel.loads = 0
+        self.builder = SharedComponentBuilder()
+        self.metadata = Metadata({"language": "en"}, None)
+
+    def load(self, component_class, **meta):
+        return self.builder.load_component(
+            {"name": f"{__name__}.{component_class.__name__}", **meta},
+            None,
+            self.metadata,
+        )
+
+    def test_shares_component_with_cache_key(self):
+        english = self.load(SharedLanguageModel, model="en")
+        self.assertIs(self.load(SharedLanguageModel, model="en"), english)
+        self.assertIsNot(self.load(SharedLanguageModel, model="pt_br"), english)
+
+    def test_builds_component_without_cache_key(self):
+        self.assertIsNot(
+            self.load(PerRepositoryComponent), self.load(PerRepositoryComponent)
+        )
+
+    def test_concurrent_loads_share_one_instance(self):
+        threads = [
+            threading.Thread(target=self.load, args=(SharedLanguageModel,), kwargs={"model": "en"})
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(SharedLanguageModel.loads, 1)
@@ -0,0 +1,66 @@
+import unittest
+import os
+import random
+import re
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from bothub.shared.utils.preprocessing.preprocessing_base import PreprocessingBase
+from bothub.shared.utils.pipeline_components.lookup_matcher import LookupMatcher
+
+LOOKUP_TABLES_DIR = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'bothub', 'shared', 'utils', 'lookup_tables'
+)
+
+
+class TestLookupMatcher(unittest.TestCase):
+    def lookup_regex_spans(self, elements, text, flags=re.IGNORECASE):
+        # the regex generated for lookup tables
+        pattern = "(\\b" + "\\b|\\b".join(re.escape(e) for e in elements) + "\\b)"
+        return [match.span() for match in re.finditer(pattern, text, flags)]
+
+    def test__finditer(self):
+        matcher = LookupMatcher(["coca", "coca-cola", "cola", "at&t"])
+        text = "Coca-Cola, cola e AT&T, mas nao cocada"
+
+        # the first element of the table wins, as in the regex
+        self.assertEqual(matcher.finditer(text), [(0, 4), (5, 9), (11, 15), (18, 22)])
+        self.assertEqual(matcher.finditer(text), self.lookup_regex_spans(
+            ["coca", "coca-cola", "cola", "at&t"], text
+        ))
+        self.assertEqual(LookupMatcher(["cola"], case_sensitive=True).finditer("Cola cola"), [(5, 9)])
+
+    def test__supports(self):
+        self.assertTrue(LookupMatcher.supports(["brasil", "at&t"]))
+        self.assertFalse(LookupMatcher.supports(["brasil", ""]))
+        self.assertFalse(LookupMatcher.supports(["são paulo"]))
+
+    def test__finditer_matches_lookup_regex(self):
+        rng = random.Random(0)
+        for _ in range(5000):
+            elements = [
+                "".join(rng.choice("ab-_ 1") for _ in range(rng.randint(1, 4)))
+                for _ in range(rng.randint(1, 6))
+            ]
+            text = "".join(rng.choice("abAB-_ .1éİıKſ") for _ in range(rng.randint(0, 14)))
+            case_sensitive = rng.random() < 0.3
+            flags = 0 if case_sensitive else re.IGNORECASE
+
+            self.assertEqual(
+                LookupMatcher(elements, case_sensitive).finditer(text),
+                self.lookup_regex_spans(elements, text, flags),
+                (elements, text),
+            )
+
+    def test__country_table(self):
+        preprocessor = PreprocessingBase()
+        with open(os.path.join(LOOKUP_TABLES_DIR, 'pt_br', 'country.txt')) as table:
+            elements = [preprocessor.preprocess(line.strip()) for line in table if line.strip()]
+
+        text = "Moro na Guiné-Bissau, nasci no Brasil e visitei o Reino Unido e a Itália"
+        for phrase in [text, preprocessor.preprocess(text)]:
+            self.assertEqual(
+                LookupMatcher(elements).finditer(phrase),
+                self.lookup_regex_spans(elements, phrase),
+            )
@@ -0,0 +1,81 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from bothub.shared.utils.model_store import ModelStore
+
+
+def fake_fetch(size):
+    def fetch(target_path):
+        os.makedirs(target_path)
+        with open(os.path.join(target_path, "model.bin"), "wb") as model_file:
+            model_file.write(b"0" * size)
+
+    return fetch
+
+
+class TestModelStore(unittest.TestCase):
+    def setUp(self, *args):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_retrieve_once(self):
+        store = ModelStore(self.directory)
+        model_key = ModelStore.model_key(49, "en", 3)
+        self.assertIsNone(store.get(model_key))
+
+        path = store.retrieve(model_key, fake_fetch(10))
+        self.assertTrue(os.path.exists(os.path.join(path, "model.bin")))
+
+        def fail(target_path):
+            raise AssertionError("model should be loaded from the store")
+
+        self.assertEqual(store.retrieve(model_key, fail), path)
+
+    def test_failed_fetch_leaves_nothing(self):
+        store = ModelStore(self.directory)
+
+        def fail(target_path):
+            os.makedirs(target_path)
+            raise ValueError
+
+        self.assertRaises(ValueError, store.retrieve, "49_en_3", fail)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_cleanup_least_recently_used(self):
+        store = ModelStore(self.directory, max_size=25)
+        store.retrieve("1_en_1", fake_fetch(10))
+        store.retrieve("2_en_1", fake_fetch(10))
+        os.utime(store.path("1_en_1"), (0, 0))
+        os.utime(store.path("2_en_1"), (1, 1))
+        store.get("1_en_1")
+        store.retrieve("3_en_1", fake_fetch(10))
+
+        self.assertEqual(sorted(store.models()), ["1_en_1", "3_en_1"])
+
+    def test_cleanup_keeps_models_in_use(self):
+        store = ModelStore(self.directory, max_size=15, in_use_seconds=0)
+        path = store.acquire("1_en_1", fake_fetch(10))
+        store.retrieve("2_en_1", fake_fetch(10))
+
+        # the acquired model is being loaded
+        self.assertTrue(os.path.isdir(path))
+        self.assertEqual(store.models(), ["1_en_1", "2_en_1"])
+
+        store.release("1_en_1")
+        store.retrieve("3_en_1", fake_fetch(10))
+        self.assertNotIn("1_en_1", store.models())
+
+    def test_cleanup_keeps_recently_used_models(self):
+        store = ModelStore(self.directory, max_size=15)
+        store.retrieve("1_en_1", fake_fetch(10))
+        store.retrieve("2_en_1", fake_fetch(10))
+
+        # another process sharing the store may be loading them
+        self.assertEqual(sorted(store.models()), ["1_en_1", "2_en_1"])
@@ -0,0 +1,62 @@
+import unittest
+import os
+import random
+import re
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from bothub.shared.utils.pipeline_components import pattern_matcher
+from bothub.shared.utils.pipeline_components.pattern_matcher import PatternMatcher
+
+
+class TestPatternMatcher(unittest.TestCase):
+    def finditer(self, patterns, text, flags=0):
+        return [
+            (index,) + match.span()
+            for index, pattern in enumerate(patterns)
+            for match in re.finditer(pattern, text, flags)
+        ]
+
+    def test__finditer(self):
+        patterns = [r"\bsao paulo\b", r"\b\d{5}-?\d{3}\b", r"\bpaulo\b", r"(\w)\1"]
+        text = "Sao Paulo 01001-000, rua Paulo, 22"
+        matcher = PatternMatcher(patterns, re.IGNORECASE)
+
+        self.assertEqual(
+            matcher.finditer(text),
+            [
+                (0, 0, 9), (1, 10, 19), (2, 4, 9), (2, 25, 30), (3, 12, 14), (3, 16, 18),
+                (3, 32, 34),
+            ],
+        )
+        # backreferences are matched by the pattern on its own
+        self.assertEqual([index for index, _ in matcher.single], [3])
+        self.assertEqual(len(matcher.combined), 1)
+
+    def test__finditer_matches_re_finditer(self):
+        atoms = [
+            "a", "b", "ab", "a+", "b*a", "[ab]", r"\b", "(a|b)", "a?b", r"\w+", "(?=a)",
+            "(?<=b)a", "^a", "a$", r"\bab\b", "a.b", r"(a)\1", "(?i:A)", ".",
+        ]
+        rng = random.Random(0)
+        default_max = pattern_matcher.COMBINED_PATTERNS_MAX
+        self.addCleanup(setattr, pattern_matcher, "COMBINED_PATTERNS_MAX", default_max)
+
+        for _ in range(2000):
+            patterns = [
+                "".join(rng.choice(atoms) for _ in range(rng.randint(1, 3)))
+                for _ in range(rng.randint(1, 8))
+            ]
+            text = "".join(rng.choice("abAB x") for _ in range(rng.randint(0, 15)))
+            flags = rng.choice([0, re.IGNORECASE])
+            pattern_matcher.COMBINED_PATTERNS_MAX = rng.choice([1, 3, default_max])
+
+            self.assertEqual(
+                PatternMatcher(patterns, flags).finditer(text),
+                self.finditer(patterns, text, flags),
+                (patterns, text),
+            )
+
+    def test__no_patterns(self):
+        self.assertEqual(PatternMatcher([]).finditer("text"), [])
@@ -0,0 +1,49 @@
+import unittest
+import base64
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from bothub.shared.utils.persistor import Base64Reader, BothubPersistor
+
+
+class TestPersistor(unittest.TestCase):
+    def setUp(self, *args):
+        self.target_path = tempfile.mkdtemp()
+
+        content = os.urandom(100000)
+        tar_data = io.BytesIO()
+        with tarfile.open(fileobj=tar_data, mode="w:gz") as tar:
+            tar_info = tarfile.TarInfo("model.bin")
+            tar_info.size = len(content)
+            tar.addfile(tar_info, io.BytesIO(content))
+
+        self.content = content
+        self.tar_data = tar_data.getvalue()
+
+    def tearDown(self):
+        shutil.rmtree(self.target_path, ignore_errors=True)
+
+    def test_base64_reader(self):
+        encoded = base64.b64encode(self.content)
+        self.assertEqual(Base64Reader(encoded, chunk_size=1000).read(), self.content)
+        self.assertEqual(
+            Base64Reader(encoded.decode(), chunk_size=1000).read(), self.content
+        )
+        # line breaks don't break the decoding
+        self.assertEqual(
+            Base64Reader(base64.encodebytes(self.content), chunk_size=1001).read(),
+            self.content,
+        )
+
+    def test_decompress_stream(self):
+        BothubPersistor._decompress_stream(
+            Base64Reader(base64.b64encode(self.tar_data)), self.target_path
+        )
+        with open(os.path.join(self.target_path, "model.bin"), "rb") as model_file:
+            self.assertEqual(model_file.read(), self.content)
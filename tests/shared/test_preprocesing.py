@@ -1,5 +1,7 @@
 import unittest
 import os
+import random
+import re
 import emoji
 
 import sys
@@ -9,6 +11,7 @@ from bothub.shared.utils.preprocessing.preprocessing_factory import Preprocessin
 from bothub.shared.utils.preprocessing.preprocessing_base import PreprocessingBase
 from bothub.shared.utils.preprocessing.preprocessing_english import PreprocessingEnglish
 from bothub.shared.utils.preprocessing.preprocessing_portuguese import PreprocessingPortuguese
+from bothub.shared.utils.preprocessing.preprocessing_cache import PreprocessingCache
 
 
 class TestPipelineBuilder(unittest.TestCase):
@@ -28,6 +31,55 @@ class TestPipelineBuilder(unittest.TestCase):
         english = PreprocessingFactory.factory('en')
         self.assertIsInstance(english, PreprocessingEnglish)
 
+    def test__factory_shared_instances(self):
+        self.assertIs(PreprocessingFactory.factory('en'), PreprocessingFactory.factory('en'))
+        self.assertIs(PreprocessingFactory.factory(), PreprocessingFactory.factory('unexisting_language'))
+        self.assertIsNot(PreprocessingFactory.factory('en'), PreprocessingFactory.factory('pt_br'))
+
+    def test__enable_cache(self):
+        PreprocessingFactory.enable_cache(2)
+        self.addCleanup(PreprocessingFactory.enable_cache, 0)
+
+        portuguese = PreprocessingFactory.factory('pt_br')
+        self.assertIsInstance(portuguese.cache, PreprocessingCache)
+        self.assertEqual(portuguese.cache.max_size, 2)
+
+        self.assertEqual(portuguese.preprocess("to bem"), "estou bem")
+        self.assertEqual(portuguese.preprocess("to bem"), "estou bem")
+        self.assertEqual((portuguese.cache.hits, portuguese.cache.misses), (1, 1))
+        self.assertEqual(portuguese.cache.hit_rate(), 0.5)
+
+        PreprocessingFactory.enable_cache(0)
+        self.assertIsNone(portuguese.cache)
+
+    def test__preprocessing_cache(self):
+        class Metrics:
+            def __init__(self):
+                self.counters = []
+
+            def increment(self, name, value=1, **labels):
+                self.counters.append((name, labels))
+
+        metrics = Metrics()
+        cache = PreprocessingCache(2, "en", metrics)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        self.assertEqual(cache.get("a"), "1")
+        cache.put("c", "3")
+
+        # "b" was the least recently used
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "3")
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(
+            metrics.counters,
+            [
+                ("preprocessing_cache_hits_total", {"language": "en"}),
+                ("preprocessing_cache_misses_total", {"language": "en"}),
+                ("preprocessing_cache_hits_total", {"language": "en"}),
+            ],
+        )
+
     def test__default_preprocessing(self):
         phrase = "i'`m GOING não tô é the gym"
         expected = "im going nao to e the gym"
@@ -60,3 +112,44 @@ class TestPipelineBuilder(unittest.TestCase):
         self.assertEqual(self.base.preprocess(phrase), "im going nao to e the gym face with tears of joy")
         self.assertEqual(self.portuguese.preprocess(phrase), "im going nao estou e the gym hahaha")
         self.assertEqual(self.english.preprocess(phrase), "im going nao to e the gym hahaha")
+
+    def test__contractions_match_sequential_rules(self):
+        pieces = [
+            "mkt", "ok", "okaaayy", "ty", "thx", "tks", "i'm", "i'mmm", "you'reee",
+            "don't", "n't", "oi", "ooiie", "s", "sss", "n", "nn", "blzzaa", "tooo",
+            "taa", "bd", "flw", "falows", "vlw", "valeus", "tranks", "'", " ", "-",
+        ] + list("abcfklmnorstuvwyz")
+        rng = random.Random(0)
+
+        for language in [self.english, self.portuguese]:
+            for _ in range(5000):
+                phrase = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 6)))
+                expected = phrase
+                for pattern, replacement in language.contractions.rules:
+                    expected = re.sub(pattern, replacement, expected)
+                self.assertEqual(language.contractions.sub(phrase), expected, phrase)
+
+    def test__emoji_handling_matches_sequential_replacement(self):
+        def sequential_emoji_handling(preprocessor, phrase):
+            phrase = emoji.demojize(phrase)
+            for code in re.findall(r":[A-Za-z0-9\-_]+:", phrase):
+                try:
+                    phrase = re.sub(code, preprocessor.emoji_contractions[code], phrase)
+                except KeyError:
+                    phrase = re.sub(code, preprocessor.extract_emoji_text(code), phrase)
+            return phrase
+
+        pieces = [
+            "😂", "🔥", "🦄", "🇧🇷", ":", "::", ":fire:", ":hahaha:", ":a:", ":b_c:",
+            "10:30", "x", "fire", "hahaha", "é", " ", "-",
+        ]
+        rng = random.Random(0)
+
+        for language in [self.base, self.english, self.portuguese]:
+            for _ in range(5000):
+                phrase = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 8)))
+                self.assertEqual(
+                    language.emoji_handling(phrase),
+                    sequential_emoji_handling(language, phrase),
+                    phrase,
+                )
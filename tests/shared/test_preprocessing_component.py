@@ -0,0 +1,112 @@
+import unittest
+import os
+import random
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from rasa.nlu.training_data import Message, TrainingData
+
+from bothub.shared.utils.pipeline_components.preprocessing import Preprocessing
+
+
+def quadratic_remove_overlapping_entities(entities):
+    """Previous implementation, comparing every entity with every other."""
+    new_entities = []
+    for i in range(len(entities)):
+        overlap = False
+        for j in range(len(entities)):
+            if i != j and (
+                entities[i]["start"] >= entities[j]["start"]
+                and entities[i]["end"] <= entities[j]["end"]
+            ):
+                overlap = True
+            elif i != j and (
+                (
+                    entities[i]["end"] > entities[j]["start"]
+                    and entities[i]["start"] < entities[j]["end"]
+                )
+                and not (
+                    entities[j]["start"] >= entities[i]["start"]
+                    and entities[j]["end"] <= entities[i]["end"]
+                )
+            ):
+                overlap = True
+        if not overlap:
+            new_entities.append(entities[i])
+    return new_entities
+
+
+class TestPreprocessingComponent(unittest.TestCase):
+    def setUp(self, *args):
+        self.component = Preprocessing({"language": None})
+
+    def test__train_removes_repeated_phrases(self):
+        examples = [
+            Message("Hello", {"intent": "greet"}),
+            Message("hi", {"intent": "greet"}),
+            Message("HELLO", {"intent": "other"}),
+            Message("héllo", {"intent": "other"}),
+            Message("bye", {"intent": "bye"}),
+        ]
+        training_data = TrainingData(training_examples=examples)
+        training_examples = training_data.training_examples
+
+        self.component.train(training_data)
+
+        # the list is changed in place, keeping the first example of each phrase
+        self.assertIs(training_data.training_examples, training_examples)
+        self.assertEqual(
+            [(example.text, example.get("intent")) for example in training_examples],
+            [("hello", "greet"), ("hi", "greet"), ("bye", "bye")],
+        )
+
+    def test__train_removes_overlapping_entities(self):
+        entities = [
+            {"start": 0, "end": 5, "value": "hello", "entity": "a"},
+            {"start": 0, "end": 11, "value": "hello world", "entity": "b"},
+        ]
+        training_data = TrainingData(
+            training_examples=[Message("hello world", {"intent": "greet", "entities": entities})]
+        )
+
+        self.component.train(training_data)
+
+        self.assertEqual(
+            training_data.training_examples[0].get("entities"), [entities[1]]
+        )
+
+    def test__remove_overlapping_entities(self):
+        entities = [
+            {"start": 10, "end": 15, "entity": "a"},
+            {"start": 0, "end": 5, "entity": "a"},
+            {"start": 0, "end": 8, "entity": "b"},
+            {"start": 12, "end": 20, "entity": "b"},
+            {"start": 22, "end": 25, "entity": "a"},
+            {"start": 22, "end": 25, "entity": "b"},
+            {"start": 30, "end": 32, "entity": "a"},
+        ]
+        # contained, crossing and identical entities are removed
+        self.assertEqual(
+            Preprocessing.remove_overlapping_entities(entities),
+            [entities[2], entities[6]],
+        )
+        self.assertEqual(Preprocessing.remove_overlapping_entities([]), [])
+
+    def test__remove_overlapping_entities_matches_quadratic_implementation(self):
+        rng = random.Random(0)
+        for _ in range(5000):
+            length = rng.randint(1, 15)
+            entities = []
+            for _ in range(rng.randint(0, 9)):
+                start = rng.randint(0, length)
+                end = rng.randint(start, min(length, start + rng.randint(0, 8)))
+                entities.append(
+                    {"start": start, "end": end, "entity": rng.choice("ab")}
+                )
+
+            self.assertEqual(
+                Preprocessing.remove_overlapping_entities(entities),
+                quadratic_remove_overlapping_entities(entities),
+                entities,
+            )
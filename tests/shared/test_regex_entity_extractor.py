@@ -0,0 +1,80 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from rasa.nlu.training_data import Message, TrainingData
+
+from bothub.shared.utils.pipeline_components.regex_entity_extractor import (
+    RegexEntityExtractorCustom,
+)
+
+
+class TestRegexEntityExtractor(unittest.TestCase):
+    def setUp(self, *args):
+        self.model_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.model_dir)
+        self.component = RegexEntityExtractorCustom({})
+        self.component.train(
+            TrainingData(
+                training_examples=[Message("moro no brasil", {"intent": "country"})],
+                regex_features=[{"name": "number", "pattern": "[0-9]+"}],
+                lookup_tables=[{"name": "country", "elements": ["brasil", "argentina"]}],
+            )
+        )
+
+    def extract(self, component, text):
+        message = Message(text)
+        component.process(message)
+        return [
+            (entity["entity"], entity["value"]) for entity in message.get("entities")
+        ]
+
+    def test__persist_and_load_lookup_matchers(self):
+        meta = self.component.persist("regex", self.model_dir)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.model_dir, meta["lookup_matchers_file"]))
+        )
+
+        loaded = RegexEntityExtractorCustom.load(meta, self.model_dir)
+
+        self.assertEqual(
+            loaded.lookup_matchers[0][1].transitions,
+            self.component.lookup_matchers[0][1].transitions,
+        )
+        self.assertEqual(
+            self.extract(loaded, "brasil 2 x 1 argentina"),
+            [("number", "2"), ("number", "1"), ("country", "brasil"), ("country", "argentina")],
+        )
+
+    def test__load_without_lookup_matchers(self):
+        meta = self.component.persist("regex", self.model_dir)
+        # models persisted before the lookup matchers were
+        del meta["lookup_matchers_file"]
+
+        loaded = RegexEntityExtractorCustom.load(meta, self.model_dir)
+
+        self.assertEqual(
+            self.extract(loaded, "argentina"), [("country", "argentina")]
+        )
+
+    def test__load_rebuilds_lookup_matchers_of_another_case(self):
+        meta = self.component.persist("regex", self.model_dir)
+        meta["case_sensitive"] = True
+
+        loaded = RegexEntityExtractorCustom.load(meta, self.model_dir)
+
+        self.assertTrue(loaded.lookup_matchers[0][1].case_sensitive)
+        self.assertEqual(self.extract(loaded, "Brasil brasil"), [("country", "brasil")])
+
+    def test__load_rebuilds_unreadable_lookup_matchers(self):
+        meta = self.component.persist("regex", self.model_dir)
+        with open(os.path.join(self.model_dir, meta["lookup_matchers_file"]), "wb") as f:
+            f.write(b"\x80\x04truncated")
+
+        loaded = RegexEntityExtractorCustom.load(meta, self.model_dir)
+
+        self.assertEqual(self.extract(loaded, "argentina"), [("country", "argentina")])
@@ -0,0 +1,73 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from bothub.shared.utils.temporary_directories import (
+    TEMPORARY_DIRECTORY_PREFIX,
+    make_temporary_directory,
+    sweep_orphaned_directories,
+    temporary_directories_usage,
+    temporary_directory_prefix,
+)
+
+
+class TestTemporaryDirectories(unittest.TestCase):
+    def setUp(self, *args):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_temporary_directory_prefix(self):
+        with tempfile.TemporaryDirectory(
+            prefix=temporary_directory_prefix(), dir=self.directory
+        ) as path:
+            with open(os.path.join(path, "model.bin"), "wb") as model_file:
+                model_file.write(b"0" * 10)
+            # found as a directory of this process
+            self.assertEqual(temporary_directories_usage(self.directory), 10)
+            self.assertEqual(sweep_orphaned_directories(self.directory), 0)
+            self.assertTrue(os.path.isdir(path))
+        self.assertFalse(os.path.exists(path))
+
+    def test_sweep_orphaned_directories(self):
+        # pids are never this big, so the process is not running
+        orphan = os.path.join(self.directory, f"{TEMPORARY_DIRECTORY_PREFIX}99999999-x")
+        owned = os.path.join(self.directory, f"{TEMPORARY_DIRECTORY_PREFIX}{os.getpid()}-y")
+        for path in [orphan, owned]:
+            os.makedirs(path)
+            with open(os.path.join(path, "model.bin"), "wb") as model_file:
+                model_file.write(b"0" * 10)
+
+        self.assertEqual(temporary_directories_usage(self.directory), 10)
+        self.assertEqual(sweep_orphaned_directories(self.directory), 10)
+        self.assertFalse(os.path.exists(orphan))
+        self.assertTrue(os.path.exists(owned))
+
+    def test_make_temporary_directory(self):
+        path = make_temporary_directory()
+        try:
+            self.assertTrue(
+                os.path.basename(path).startswith(
+                    f"{TEMPORARY_DIRECTORY_PREFIX}{os.getpid()}-"
+                )
+            )
+        finally:
+            shutil.rmtree(path)
+
+    def test_sweep_leaves_other_directories(self):
+        orphan = os.path.join(self.directory, f"{TEMPORARY_DIRECTORY_PREFIX}99999999-x")
+        # a model store next to the temporary directories, sharing the prefix
+        model_store = os.path.join(self.directory, f"{TEMPORARY_DIRECTORY_PREFIX}models")
+        for path in [orphan, os.path.join(model_store, "5_en_2020")]:
+            os.makedirs(path)
+            with open(os.path.join(path, "model.bin"), "wb") as model_file:
+                model_file.write(b"0" * 10)
+
+        self.assertEqual(sweep_orphaned_directories(self.directory), 10)
+        self.assertFalse(os.path.exists(orphan))
+        self.assertTrue(os.path.exists(os.path.join(model_store, "5_en_2020")))
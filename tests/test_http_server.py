@@ -0,0 +1,100 @@
+import unittest
+import os
+import socket
+import threading
+import time
+
+import requests
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bothub.nlu_worker.http_server import ParseServer
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestParseServer(unittest.TestCase):
+    def setUp(self, *args):
+        self.release = threading.Event()
+        self.release.set()
+
+        def parse(
+            repository_version,
+            repository_authorization,
+            text,
+            rasa_format=False,
+            outputs=None,
+        ):
+            self.release.wait(5)
+            if text == "fail":
+                raise ValueError("invalid text")
+            return {"text": text, "rasa_format": rasa_format, "outputs": outputs}
+
+        def parse_batch(repository_version, repository_authorization, texts):
+            return [{"text": text} for text in texts]
+
+        self.server = ParseServer(
+            parse, parse_batch, lambda: "bothub_nlp_up 1\n", workers=1, max_pending=1
+        )
+        port = free_port()
+        self.server.start("127.0.0.1", port)
+        self.url = f"http://127.0.0.1:{port}"
+
+    def tearDown(self):
+        self.release.set()
+        self.server.stop()
+
+    def post(self, path, **arguments):
+        return requests.post(
+            f"{self.url}{path}",
+            json=dict(repository_version=49, repository_authorization="auth", **arguments),
+        )
+
+    def test_parse(self):
+        response = self.post("/parse", text="ok", rasa_format=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"text": "ok", "rasa_format": True, "outputs": None}
+        )
+
+        response = self.post("/parse", text="ok", outputs=["intent"])
+        self.assertEqual(response.json()["outputs"], ["intent"])
+
+        response = self.post("/parse_batch", texts=["oi", "ok"])
+        self.assertEqual(response.json(), [{"text": "oi"}, {"text": "ok"}])
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.post("/parse").status_code, 400)
+        self.assertEqual(self.post("/parse", text="ok", unknown=1).status_code, 400)
+        self.assertEqual(self.post("/parse", text=["ok"]).status_code, 400)
+        self.assertEqual(self.post("/parse_batch", texts="ok").status_code, 400)
+        self.assertEqual(self.post("/parse", text="ok", rasa_format=1).status_code, 400)
+        self.assertEqual(
+            self.post("/parse", text="ok", outputs=["sentiment"]).status_code, 400
+        )
+        # the caches and the debug profile are not controlled by requests
+        self.assertEqual(self.post("/parse", text="ok", use_cache=False).status_code, 400)
+        self.assertEqual(self.post("/parse", text="ok", debug=True).status_code, 400)
+
+    def test_parse_errors(self):
+        self.assertEqual(self.post("/parse", text="fail").status_code, 500)
+
+    def test_too_many_pending_parses(self):
+        self.release.clear()
+        first = threading.Thread(target=self.post, args=("/parse",), kwargs={"text": "ok"})
+        first.start()
+        while self.server.pending < 1:
+            time.sleep(0.001)
+
+        self.assertEqual(self.post("/parse", text="ok").status_code, 503)
+        self.release.set()
+        first.join()
+
+    def test_metrics(self):
+        response = requests.get(f"{self.url}/metrics")
+        self.assertEqual(response.text, "bothub_nlp_up 1\n")
@@ -0,0 +1,82 @@
+import unittest
+import os
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bothub.nlu_worker.interpreter_cache import InterpreterCache
+
+
+class TestInterpreterCache(unittest.TestCase):
+    def test_hit_and_miss(self):
+        cache = InterpreterCache()
+        self.assertIsNone(cache.get("49_en", "3"))
+        cache.put("49_en", "interpreter", "3")
+
+        self.assertEqual(cache.get("49_en", "3")["interpreter_data"], "interpreter")
+        # a different training is a miss
+        self.assertIsNone(cache.get("49_en", "4"))
+
+        info = cache.info()
+        self.assertEqual(info["hits"], 1)
+        self.assertEqual(info["misses"], 2)
+
+    def test_lru_eviction_by_entries(self):
+        cache = InterpreterCache(max_entries=2)
+        cache.put("1_en", "a", "1")
+        cache.put("2_en", "b", "1")
+        cache.get("1_en")
+        cache.put("3_en", "c", "1")
+
+        self.assertIn("1_en", cache)
+        self.assertNotIn("2_en", cache)
+        self.assertIn("3_en", cache)
+        self.assertEqual(cache.info()["evictions"], 1)
+
+    def test_lfu_eviction(self):
+        cache = InterpreterCache(max_entries=2, policy="lfu")
+        cache.put("1_en", "a", "1")
+        cache.put("2_en", "b", "1")
+        cache.get("1_en")
+        cache.get("1_en")
+        cache.get("2_en")
+        cache.put("3_en", "c", "1")
+
+        self.assertIn("1_en", cache)
+        self.assertNotIn("2_en", cache)
+
+    def test_eviction_by_memory(self):
+        cache = InterpreterCache(max_memory=100)
+        cache.put("1_en", "a", "1", size=60)
+        cache.put("2_en", "b", "1", size=60)
+
+        self.assertNotIn("1_en", cache)
+        self.assertEqual(cache.memory, 60)
+
+        # an entry bigger than the limit is still kept
+        cache.put("3_en", "c", "1", size=200)
+        self.assertEqual(len(cache), 1)
+        self.assertIn("3_en", cache)
+
+    def test_invalid_policy(self):
+        self.assertRaises(ValueError, InterpreterCache, policy="fifo")
+
+    def test_pop(self):
+        cache = InterpreterCache()
+        cache.put("49_en", "interpreter", "3")
+
+        self.assertIsNone(cache.pop("49_en"))
+        self.assertNotIn("49_en", cache)
+        cache.pop("49_en")
+
+    def test_entries_returned_outlive_eviction(self):
+        cache = InterpreterCache(max_entries=1)
+        cache.put("1_en", "a", "1")
+        entry = cache.get("1_en")
+        peeked = cache.peek("1_en")
+
+        cache.put("2_en", "b", "1")
+
+        self.assertNotIn("1_en", cache)
+        self.assertEqual(entry["interpreter_data"], "a")
+        self.assertEqual(peeked["interpreter_data"], "a")
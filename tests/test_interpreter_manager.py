@@ -0,0 +1,197 @@
+import unittest
+import uuid
+import base64
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from rasa.nlu import __version__ as rasa_version
+
+from bothub.nlu_worker.interpreter_manager import InterpreterManager
+
+
+class TestInterpreterManager(unittest.TestCase):
+    def setUp(self, *args):
+        self.repository_authorization = uuid.uuid4()
+        self.repository_version = 6647
+
+    # change directory to /tests
+    try:
+        os.chdir("tests")
+    except Exception:
+        pass
+
+    @patch(
+        "bothub_backend.bothub.BothubBackend.request_backend_parse_nlu_persistor",
+        return_value={
+            "version_id": 49,
+            "repository_uuid": "0f6b9644-db55-49a2-a20d-2af74106d892",
+            "total_training_end": 3,
+            "language": "pt_br",
+            "bot_data": base64.b64encode(
+                open("example_generic_language.tar.gz", "rb").read()
+            ),
+            "from_aws": False,
+        },
+    )
+    def test_freshness_ttl(self, request_persistor):
+        interpreter_manager = InterpreterManager(freshness_ttl=60)
+
+        interpreter = interpreter_manager.get_interpreter(
+            self.repository_version, self.repository_authorization, rasa_version
+        )
+        calls = request_persistor.call_count
+
+        cached_interpreter = interpreter_manager.get_interpreter(
+            self.repository_version, self.repository_authorization, rasa_version
+        )
+        self.assertIs(interpreter, cached_interpreter)
+        # the training was trusted without asking the backend again
+        self.assertEqual(request_persistor.call_count, calls)
+
+        interpreter_manager.invalidate(self.repository_version)
+        interpreter_manager.get_interpreter(
+            self.repository_version, self.repository_authorization, rasa_version
+        )
+        self.assertEqual(request_persistor.call_count, calls + 1)
+        self.assertEqual(interpreter_manager.cache_info()["hits"], 2)
+
+    @patch(
+        "bothub_backend.bothub.BothubBackend.request_backend_parse_nlu_persistor",
+        return_value={
+            "version_id": 49,
+            "repository_uuid": "0f6b9644-db55-49a2-a20d-2af74106d892",
+            "total_training_end": 3,
+            "language": "pt_br",
+        },
+    )
+    def test_single_flight_loading(self, *args):
+        interpreter_manager = InterpreterManager()
+
+        def slow_load(*args):
+            time.sleep(0.2)
+            return object(), tempfile.mkdtemp()
+
+        results = []
+
+        def parse():
+            results.append(
+                interpreter_manager.get_interpreter(
+                    self.repository_version, self.repository_authorization, rasa_version
+                )
+            )
+
+        with patch.object(
+            InterpreterManager, "_load_interpreter", side_effect=slow_load
+        ) as load_interpreter:
+            threads = [threading.Thread(target=parse) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(load_interpreter.call_count, 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_hot_swap(self):
+        interpreter_manager = InterpreterManager(hot_swap=True)
+        update_request = {"version_id": 49, "language": "en", "total_training_end": 3}
+        old_interpreter, new_interpreter = object(), object()
+        release_load = threading.Event()
+
+        def load(update_request, *args):
+            if update_request["total_training_end"] == 4:
+                release_load.wait(5)
+                return new_interpreter, tempfile.mkdtemp()
+            return old_interpreter, tempfile.mkdtemp()
+
+        def request_update(*args):
+            return (
+                dict(update_request),
+                "49_en",
+                str(update_request["total_training_end"]),
+            )
+
+        with patch.object(
+            InterpreterManager, "_load_interpreter", side_effect=load
+        ), patch.object(
+            InterpreterManager, "_request_update", side_effect=request_update
+        ):
+            get_interpreter = lambda: interpreter_manager.get_interpreter(  # noqa: E731
+                self.repository_version, self.repository_authorization, rasa_version
+            )
+            self.assertIs(get_interpreter(), old_interpreter)
+
+            # retrained, the previous training is served while the new one loads
+            update_request["total_training_end"] = 4
+            self.assertIs(get_interpreter(), old_interpreter)
+
+            release_load.set()
+            deadline = time.monotonic() + 5
+            while get_interpreter() is not new_interpreter:
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.01)
+
+    def test_validated_trainings_of_evicted_repositories_are_pruned(self):
+        interpreter_manager = InterpreterManager(max_entries=1)
+
+        def request_update(repository_version, *args):
+            return (
+                {"version_id": repository_version, "total_training_end": 3},
+                f"{repository_version}_en",
+                "3",
+            )
+
+        with patch.object(
+            InterpreterManager,
+            "_load_interpreter",
+            side_effect=lambda *args: (object(), tempfile.mkdtemp()),
+        ), patch.object(
+            InterpreterManager, "_request_update", side_effect=request_update
+        ):
+            for repository_version in [1, 2, 3]:
+                interpreter_manager.get_interpreter(
+                    repository_version, self.repository_authorization, rasa_version
+                )
+
+        self.assertEqual(
+            [
+                validated["repository_name"]
+                for validated in interpreter_manager.validated_trainings.values()
+            ],
+            ["3_en"],
+        )
+
+    def test_request_uses_are_bounded(self):
+        interpreter_manager = InterpreterManager()
+
+        with patch(
+            "bothub.nlu_worker.interpreter_manager.REQUEST_USES_MAX_KEYS", 4
+        ):
+            for request_key in ["a", "a", "b", "c", "d", "e"]:
+                interpreter_manager._count_use((request_key, "token"))
+
+        self.assertLessEqual(len(interpreter_manager.request_uses), 4)
+        self.assertEqual(interpreter_manager.most_used(1), [["a", "token"]])
+
+    def test_failed_revalidation_forgets_the_training(self):
+        interpreter_manager = InterpreterManager(freshness_ttl=60)
+        request_key = interpreter_manager._request_key(
+            self.repository_version, self.repository_authorization
+        )
+        interpreter_manager._set_validated(request_key, "49_en", "3")
+
+        with patch.object(
+            InterpreterManager, "_request_update", side_effect=ValueError("denied")
+        ):
+            interpreter_manager._revalidate(
+                request_key, self.repository_authorization, rasa_version
+            )
+
+        self.assertNotIn(request_key, interpreter_manager.validated_trainings)
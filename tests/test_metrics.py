@@ -0,0 +1,51 @@
+import unittest
+import os
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bothub.nlu_worker.metrics import Metrics, StatsdHook, COUNTER, TIMING
+
+
+class TestMetrics(unittest.TestCase):
+    def test_prometheus_text(self):
+        metrics = Metrics("bothub_nlp")
+        metrics.increment("interpreter_cache_hits_total")
+        metrics.increment("interpreter_cache_hits_total")
+        metrics.gauge("interpreter_cache_entries", 3)
+        metrics.timing("interpreter_load_seconds", 0.5, stage="download")
+        metrics.timing("interpreter_load_seconds", 1.5, stage="download")
+
+        text = metrics.prometheus_text()
+
+        self.assertIn("# TYPE bothub_nlp_interpreter_cache_hits_total counter", text)
+        self.assertIn("bothub_nlp_interpreter_cache_hits_total 2\n", text)
+        self.assertIn("bothub_nlp_interpreter_cache_entries 3\n", text)
+        self.assertIn(
+            'bothub_nlp_interpreter_load_seconds_count{stage="download"} 2\n', text
+        )
+        self.assertIn(
+            'bothub_nlp_interpreter_load_seconds_sum{stage="download"} 2.0\n', text
+        )
+
+    def test_hooks(self):
+        metrics = Metrics()
+        recorded = []
+        metrics.add_hook(lambda *args: recorded.append(args))
+
+        def failing_hook(*args):
+            raise ValueError
+
+        metrics.add_hook(failing_hook)
+        metrics.increment("interpreter_loads_total", repository="49_en")
+
+        self.assertEqual(
+            recorded, [(COUNTER, "interpreter_loads_total", 1, {"repository": "49_en"})]
+        )
+
+    def test_statsd_format(self):
+        hook = StatsdHook("localhost", prefix="bothub_nlp")
+        self.assertEqual(
+            hook.format(TIMING, "interpreter_load_seconds", 0.25, {"stage": "create"}),
+            "bothub_nlp.interpreter_load_seconds.stage.create:250.0|ms",
+        )
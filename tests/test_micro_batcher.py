@@ -0,0 +1,75 @@
+import unittest
+import os
+import threading
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bothub.nlu_worker.micro_batcher import MicroBatcher
+
+
+class FakeInterpreter:
+    def __init__(self):
+        self.batches = []
+
+    def parse_batch(self, texts, outputs=None):
+        self.batches.append(list(texts))
+        return [{"text": text} for text in texts]
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def parse_concurrently(self, micro_batcher, interpreter, texts):
+        results = {}
+
+        def parse(text):
+            results[text] = micro_batcher.parse(interpreter, text)
+
+        threads = [threading.Thread(target=parse, args=(text,)) for text in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_gathers_concurrent_parses(self):
+        interpreter = FakeInterpreter()
+        texts = ["oi", "ok", "menu", "tchau"]
+
+        results = self.parse_concurrently(MicroBatcher(5, len(texts)), interpreter, texts)
+
+        self.assertEqual(len(interpreter.batches), 1)
+        self.assertEqual(sorted(interpreter.batches[0]), sorted(texts))
+        for text in texts:
+            self.assertEqual(results[text], {"text": text})
+
+    def test_window_ends_batch(self):
+        interpreter = FakeInterpreter()
+
+        self.assertEqual(
+            MicroBatcher(0.001, 10).parse(interpreter, "oi"), {"text": "oi"}
+        )
+        self.assertEqual(interpreter.batches, [["oi"]])
+
+    def test_errors_reach_every_caller(self):
+        class FailingInterpreter:
+            def parse_batch(self, texts, outputs=None):
+                raise ValueError
+
+        micro_batcher = MicroBatcher(0.001, 10)
+        self.assertRaises(ValueError, micro_batcher.parse, FailingInterpreter(), "oi")
+
+    def test_preprocessed_texts(self):
+        class PreprocessedInterpreter(FakeInterpreter):
+            def parse_batch(self, texts, outputs=None, preprocessed_texts=None):
+                self.batches.append(preprocessed_texts)
+                return [{"text": text} for text in preprocessed_texts or texts]
+
+        interpreter = PreprocessedInterpreter()
+        micro_batcher = MicroBatcher(0.001, 10)
+
+        self.assertEqual(
+            micro_batcher.parse(interpreter, "Oi!", preprocessed_text="oi"),
+            {"text": "oi"},
+        )
+        self.assertEqual(micro_batcher.parse(interpreter, "Oi!"), {"text": "Oi!"})
+        self.assertEqual(interpreter.batches, [["oi"], None])
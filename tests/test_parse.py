@@ -7,8 +7,9 @@ from unittest.mock import patch
 import sys
 sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from bothub.nlu_worker.task.parse import parse_text
+from bothub.nlu_worker.task.parse import parse_text, parse_text_batch
 from bothub.nlu_worker.interpreter_manager import InterpreterManager
+from rasa.nlu import __version__ as rasa_version
 
 
 class TestParseTask(unittest.TestCase):
@@ -72,3 +73,133 @@ class TestParseTask(unittest.TestCase):
             "ok",
             True,
         )
+
+    @patch(
+        "bothub_backend.bothub.BothubBackend.request_backend_parse_nlu_persistor",
+        return_value={
+            "version_id": 49,
+            "repository_uuid": "0f6b9644-db55-49a2-a20d-2af74106d892",
+            "total_training_end": 3,
+            "language": "pt_br",
+            "bot_data": base64.b64encode(
+                open("example_generic_language.tar.gz", "rb").read()
+            ),
+            "from_aws": False,
+        },
+    )
+    def test_parse_batch(self, *args):
+        texts = ["ok", "", "quero comprar um carro", "ok"]
+
+        results = parse_text_batch(
+            self.current_update.get("current_version_id"),
+            self.repository_authorization,
+            self.interpreter_manager,
+            texts,
+        )
+
+        self.assertEqual(len(results), len(texts))
+        for text, result in zip(texts, results):
+            expected = parse_text(
+                self.current_update.get("current_version_id"),
+                self.repository_authorization,
+                self.interpreter_manager,
+                text,
+            )
+            self.assertEqual(result["intent"]["name"], expected["intent"]["name"])
+            self.assertEqual(result["entities"], expected["entities"])
+
+    @patch(
+        "bothub_backend.bothub.BothubBackend.request_backend_parse_nlu_persistor",
+        return_value={
+            "version_id": 49,
+            "repository_uuid": "0f6b9644-db55-49a2-a20d-2af74106d892",
+            "total_training_end": 3,
+            "language": "pt_br",
+            "bot_data": base64.b64encode(
+                open("example_generic_language.tar.gz", "rb").read()
+            ),
+            "from_aws": False,
+        },
+    )
+    def test_parse_with_debug_profile(self, *args):
+        result = parse_text(
+            self.current_update.get("current_version_id"),
+            self.repository_authorization,
+            self.interpreter_manager,
+            "ok",
+            debug=True,
+        )
+
+        interpreter = self.interpreter_manager.get_interpreter(
+            self.current_update.get("current_version_id"),
+            self.repository_authorization,
+            rasa_version,
+        )
+        self.assertEqual(
+            [component["component"] for component in result["profile"]],
+            [type(component).__name__ for component in interpreter.pipeline],
+        )
+
+    @patch(
+        "bothub_backend.bothub.BothubBackend.request_backend_parse_nlu_persistor",
+        return_value={
+            "version_id": 49,
+            "repository_uuid": "0f6b9644-db55-49a2-a20d-2af74106d892",
+            "total_training_end": 3,
+            "language": "pt_br",
+            "bot_data": base64.b64encode(
+                open("example_generic_language.tar.gz", "rb").read()
+            ),
+            "from_aws": False,
+        },
+    )
+    def test_parse_intent_only(self, *args):
+        parse = lambda **kwargs: parse_text(  # noqa: E731
+            self.current_update.get("current_version_id"),
+            self.repository_authorization,
+            self.interpreter_manager,
+            "quero comprar um carro",
+            **kwargs
+        )
+
+        result = parse(outputs=["intent"])
+
+        self.assertEqual(result["intent"], parse()["intent"])
+        self.assertEqual(result["entities"], [])
+        self.assertRaises(ValueError, parse, outputs=["sentiment"])
+
+    @patch(
+        "bothub_backend.bothub.BothubBackend.request_backend_parse_nlu_persistor",
+        return_value={
+            "version_id": 49,
+            "repository_uuid": "0f6b9644-db55-49a2-a20d-2af74106d892",
+            "total_training_end": 3,
+            "language": "pt_br",
+            "bot_data": base64.b64encode(
+                open("example_generic_language.tar.gz", "rb").read()
+            ),
+            "from_aws": False,
+        },
+    )
+    def test_parse_preprocesses_once(self, *args):
+        from bothub.nlu_worker.parse_cache import ParseResultCache
+        from bothub.shared.utils.pipeline_components.preprocessing import (
+            Preprocessing,
+        )
+
+        parse = lambda **kwargs: parse_text(  # noqa: E731
+            self.current_update.get("current_version_id"),
+            self.repository_authorization,
+            self.interpreter_manager,
+            "Quero comprar um carro!",
+            **kwargs
+        )
+        expected = parse(use_cache=False)
+
+        with patch.object(
+            Preprocessing, "preprocess", autospec=True, side_effect=Preprocessing.preprocess
+        ) as preprocess:
+            result = parse(result_cache=ParseResultCache(10))
+
+        self.assertEqual(preprocess.call_count, 1)
+        self.assertEqual(result, expected)
@@ -0,0 +1,63 @@
+import unittest
+import gc
+import os
+import time
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bothub.nlu_worker.parse_cache import ParseResultCache
+
+
+class FakeInterpreter:
+    pass
+
+
+class TestParseResultCache(unittest.TestCase):
+    def test_results_of_each_interpreter(self):
+        cache = ParseResultCache(10)
+        interpreter, retrained = FakeInterpreter(), FakeInterpreter()
+        cache.put(interpreter, ("ok", False), {"intent": {"name": "affirm"}})
+
+        self.assertEqual(
+            cache.get(interpreter, ("ok", False)), {"intent": {"name": "affirm"}}
+        )
+        self.assertIsNone(cache.get(interpreter, ("ok", True)))
+        self.assertIsNone(cache.get(retrained, ("ok", False)))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_returns_copies(self):
+        cache = ParseResultCache(10)
+        interpreter = FakeInterpreter()
+        cache.put(interpreter, "ok", {"entities": []})
+        cache.get(interpreter, "ok")["entities"].append("changed")
+
+        self.assertEqual(cache.get(interpreter, "ok"), {"entities": []})
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ParseResultCache(2)
+        interpreter = FakeInterpreter()
+        cache.put(interpreter, "oi", 1)
+        cache.put(interpreter, "ok", 2)
+        cache.get(interpreter, "oi")
+        cache.put(interpreter, "menu", 3)
+
+        self.assertEqual(cache.get(interpreter, "oi"), 1)
+        self.assertIsNone(cache.get(interpreter, "ok"))
+
+    def test_ttl(self):
+        cache = ParseResultCache(10, ttl=0.01)
+        interpreter = FakeInterpreter()
+        cache.put(interpreter, "ok", 1)
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get(interpreter, "ok"))
+
+    def test_dropped_with_interpreter(self):
+        cache = ParseResultCache(10)
+        interpreter = FakeInterpreter()
+        cache.put(interpreter, "ok", 1)
+        del interpreter
+        gc.collect()
+
+        self.assertEqual(len(cache._results), 0)
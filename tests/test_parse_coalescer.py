@@ -0,0 +1,55 @@
+import unittest
+import os
+import threading
+import time
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bothub.nlu_worker.parse_coalescer import ParseCoalescer
+
+
+class TestParseCoalescer(unittest.TestCase):
+    def test_concurrent_parses_run_once(self):
+        coalescer = ParseCoalescer()
+        interpreter = object()
+        release = threading.Event()
+        calls = []
+
+        def parse():
+            calls.append(1)
+            release.wait(5)
+            return {"entities": []}
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(coalescer.parse(interpreter, "ok", parse))
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        while coalescer.coalesced < 4:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"entities": []}] * 5)
+        # followers get their own copy of the result
+        self.assertEqual(len({id(result) for result in results}), 5)
+
+    def test_different_interpreters_are_not_coalesced(self):
+        coalescer = ParseCoalescer()
+        self.assertEqual(coalescer.parse(object(), "ok", lambda: 1), 1)
+        self.assertEqual(coalescer.parse(object(), "ok", lambda: 2), 2)
+
+    def test_errors_are_raised(self):
+        def parse():
+            raise ValueError
+
+        coalescer = ParseCoalescer()
+        self.assertRaises(ValueError, coalescer.parse, object(), "ok", parse)
+        self.assertEqual(coalescer._in_flight, {})
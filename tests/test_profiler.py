@@ -0,0 +1,31 @@
+import unittest
+import os
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bothub.nlu_worker.profiler import PipelineProfiler
+
+
+class TestPipelineProfiler(unittest.TestCase):
+    def test_aggregates_per_repository_and_component(self):
+        profiler = PipelineProfiler(1)
+        profile = [
+            {"component": "Preprocessing", "seconds": 0.5, "allocated_blocks": 10},
+            {"component": "DIETClassifierCustom", "seconds": 1.0, "allocated_blocks": 4},
+        ]
+        profiler.record(49, profile)
+        profiler.record(49, profile)
+        profiler.record(50, profile[:1])
+
+        stats = profiler.stats()
+        self.assertEqual(
+            stats["49"]["Preprocessing"],
+            {"calls": 2, "seconds": 1.0, "allocated_blocks": 20},
+        )
+        self.assertEqual(stats["49"]["DIETClassifierCustom"]["calls"], 2)
+        self.assertEqual(list(stats["50"].keys()), ["Preprocessing"])
+
+    def test_sample_rate(self):
+        self.assertTrue(PipelineProfiler(1).should_profile())
+        self.assertFalse(PipelineProfiler(0).should_profile())
@@ -0,0 +1,71 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+
+import sys
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bothub.nlu_worker.warmup import (
+    load_snapshot,
+    parse_warmup_repositories,
+    save_snapshot,
+    warm_up,
+)
+
+
+class FakeInterpreterManager:
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.loaded = []
+
+    def get_interpreter(
+        self, repository_version, repository_authorization, *args, count_use=True
+    ):
+        time.sleep(self.delay)
+        self.loaded.append((repository_version, repository_authorization, count_use))
+
+    def most_used(self, size):
+        return [["6647", "token"]][:size]
+
+
+class TestWarmUp(unittest.TestCase):
+    def test_parse_warmup_repositories(self):
+        self.assertEqual(
+            parse_warmup_repositories("6647:token|invalid| 49:other "),
+            [("6647", "token"), ("49", "other")],
+        )
+        self.assertEqual(parse_warmup_repositories(""), [])
+
+    def test_snapshot(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "snapshot.json")
+        try:
+            self.assertEqual(load_snapshot(path), [])
+            save_snapshot(path, FakeInterpreterManager(), 10)
+            self.assertEqual(load_snapshot(path), [("6647", "token")])
+            # authorizations are readable only by the owner
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+            self.assertEqual(os.listdir(directory), ["snapshot.json"])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_warm_up(self):
+        interpreter_manager = FakeInterpreterManager()
+        loaded = warm_up(
+            interpreter_manager, [("6647", "token"), ("6647", "token"), ("49", "a")], 10
+        )
+        self.assertEqual(loaded, 2)
+        # warm-up loads are not counted as requests
+        self.assertEqual(
+            sorted(interpreter_manager.loaded),
+            [("49", "a", False), ("6647", "token", False)],
+        )
+
+    def test_warm_up_timeout(self):
+        interpreter_manager = FakeInterpreterManager(delay=0.5)
+        started = time.monotonic()
+        loaded = warm_up(interpreter_manager, [("6647", "token")], 0.05)
+        self.assertEqual(loaded, 0)
+        self.assertLess(time.monotonic() - started, 0.5)